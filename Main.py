@@ -1,101 +1,173 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from datetime import datetime, timedelta
+from concurrent.futures import Future, ThreadPoolExecutor
+import queue
+from datetime import date, timedelta
 import numpy as np
 from tkcalendar import DateEntry
-from typing import List, Dict, Tuple, Set
+from typing import List, Dict, Tuple
 import json
 
+from backend.config import EARTH_RADIUS_KM, TSP_2OPT_MAX_ITERATIONS
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+_DATE_FMT = '%B %d'
+_POLL_MS = 50  # how often the Tk thread checks for finished plans
+
 with open('data.json', 'r') as file:
     country_data = json.load(file)
 
+@njit(cache=True)
+def _nn_route(D: np.ndarray, start: int, idx: np.ndarray) -> np.ndarray:
+    n = len(idx)
+    route = np.empty(n + 2, dtype=np.int64)
+    route[0] = start
+    route[n + 1] = start
+    visited = np.zeros(n, dtype=np.bool_)
+    current = start
+    for step in range(n):
+        nearest = -1
+        nearest_dist = np.inf
+        for k in range(n):
+            if not visited[k] and D[current, idx[k]] < nearest_dist:
+                nearest = k
+                nearest_dist = D[current, idx[k]]
+        visited[nearest] = True
+        current = idx[nearest]
+        route[step + 1] = current
+    return route
+
+@njit(cache=True)
+def _two_opt(D: np.ndarray, route: np.ndarray, max_iter: int) -> np.ndarray:
+    r = route.copy()
+    n = len(r)
+    improved = True
+    iterations = 0
+    while improved and iterations < max_iter:
+        improved = False
+        iterations += 1
+        for i in range(1, n - 2):
+            # Reversing r[i:j+1] swaps edges (i-1, i) and (j, j+1)
+            # for (i-1, j) and (i, j+1); apply the best j for this i.
+            best_j = -1
+            best_delta = -1e-9
+            for j in range(i + 1, n - 1):
+                delta = (D[r[i - 1], r[j]] + D[r[i], r[j + 1]]
+                         - D[r[i - 1], r[i]] - D[r[j], r[j + 1]])
+                if delta < best_delta:
+                    best_j = j
+                    best_delta = delta
+            if best_j > 0:
+                lo, hi = i, best_j
+                while lo < hi:
+                    r[lo], r[hi] = r[hi], r[lo]
+                    lo += 1
+                    hi -= 1
+                improved = True
+    return r
+
 class CountryData:
     def __init__(self, country_data: Dict):
         self.countries_data = country_data
-        self.all_interests = sorted(list(set(
+        self.all_interests = tuple(sorted(set(
             interest for country in self.countries_data.values() 
             for interest in country['interests']
         )))
+        self.sorted_names = tuple(sorted(self.countries_data))
+        self.interest_bit = {name: 1 << i for i, name in enumerate(self.all_interests)}
+        for country in self.countries_data.values():
+            country['interest_mask'] = self.interests_to_mask(country['interests'])
+        self.index = {name: i for i, name in enumerate(self.sorted_names)}
+        self.coords = np.array([self.countries_data[name]["coordinates"] for name in self.index],
+                               dtype=np.float64)
+        self.names = self.sorted_names
+        self.lat_rad = np.radians(self.coords[:, 0])
+        self.lon_rad = np.radians(self.coords[:, 1])
+        self.dist = self.haversine_matrix()
+        # Costs are whole USD, so int32 is exact and keeps budget maths in integers
+        self.travel_cost = np.array([self.countries_data[name]["avg_travel_cost"] for name in self.index],
+                                    dtype=np.int32)
+        self.accom_cost = np.array([self.countries_data[name]["avg_accommodation_cost"] for name in self.index],
+                                   dtype=np.int32)
+        self.min_cost = self.travel_cost + self.accom_cost * 2
+        self.interest_masks = np.array([self.countries_data[name]["interest_mask"] for name in self.index],
+                                       dtype=np.uint64)
+        # Position in data.json, used to break ranking ties the way dict iteration did
+        self.file_pos = np.zeros(len(self.index), dtype=np.int64)
+        self.file_pos[[self.index[name] for name in self.countries_data]] = np.arange(len(self.index))
+
+    def interests_to_mask(self, interests) -> int:
+        mask = 0
+        for interest in interests:
+            mask |= self.interest_bit.get(interest, 0)
+        return mask
+
+    def match_counts(self, idx: np.ndarray, user_mask: int) -> np.ndarray:
+        """Number of user interests each indexed country matches"""
+        return np.bitwise_count(self.interest_masks[idx] & np.uint64(user_mask)).astype(np.int64)
+
+    def haversine_matrix(self) -> np.ndarray:
+        dlat = self.lat_rad[:, None] - self.lat_rad[None, :]
+        dlon = self.lon_rad[:, None] - self.lon_rad[None, :]
+        a = (np.sin(dlat / 2)**2 +
+             np.cos(self.lat_rad)[:, None] * np.cos(self.lat_rad)[None, :] * np.sin(dlon / 2)**2)
+        # Rounding can push a a hair past 1 for near-antipodal pairs (arcsin would give NaN)
+        np.clip(a, 0.0, 1.0, out=a)
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
 
 class TourOptimizer:
     def __init__(self, country_data: CountryData):
         self.country_data = country_data
 
-    def calculate_distance(self, coord1: Tuple[float, float], coord2: Tuple[float, float]) -> float:
-        return np.sqrt((coord1[0] - coord2[0])**2 + (coord1[1] - coord2[1])**2)
-
     def solve_tsp(self, selected_countries: List[str], home_country: str) -> List[str]:
         if not selected_countries:
             return []
         
-        if home_country in selected_countries:
-            selected_countries.remove(home_country)
-        
-        route = [home_country]
-        unvisited = set(selected_countries)
-        current = home_country
-
-        while unvisited:
-            next_country = min(
-                unvisited,
-                key=lambda x: self.calculate_distance(
-                    self.country_data.countries_data[current]["coordinates"],
-                    self.country_data.countries_data[x]["coordinates"]
-                )
-            )
-            route.append(next_country)
-            unvisited.remove(next_country)
-            current = next_country
-
-        route.append(home_country)
-        return route
+        index = self.country_data.index
+        idx = np.array([index[c] for c in selected_countries if c != home_country],
+                       dtype=np.int64)
+        route = _nn_route(self.country_data.dist, index[home_country], idx)
+        if len(route) > 4:
+            route = _two_opt(self.country_data.dist, route, TSP_2OPT_MAX_ITERATIONS)
+        return [self.country_data.names[i] for i in route]
 
-    def calculate_country_interest_score(self, country: str, selected_interests: Set[str]) -> int:
-        country_interests = set(self.country_data.countries_data[country]["interests"])
-        return len(country_interests.intersection(selected_interests))
+    def calculate_country_interest_score(self, country: str, user_mask: int) -> int:
+        return (self.country_data.countries_data[country]["interest_mask"] & user_mask).bit_count()
 
     def distribute_days(self, total_days: int, route: List[str], 
-                       selected_interests: Set[str]) -> Dict[str, int]:
-        days_per_country = {}
+                       user_mask: int) -> Dict[str, int]:
         countries = route[1:-1]  
 
-        interest_scores = {
-            country: self.calculate_country_interest_score(country, selected_interests)
-            for country in countries
-        }
+        index = self.country_data.index
+        scores = self.country_data.match_counts(
+            np.array([index[country] for country in countries], dtype=np.int64), user_mask)
         
-        total_score = sum(interest_scores.values())
+        total_score = int(scores.sum())
         if total_score == 0:
             base_days = total_days // len(countries)
-            days_per_country = {country: base_days for country in countries}
-        else:
-            remaining_days = total_days
-            min_days = 2
-            
-            for country in countries:
-                days_per_country[country] = min_days
-                remaining_days -= min_days
-            
-            for country in countries:
-                if total_score > 0:
-                    additional_days = int((remaining_days * interest_scores[country]) / total_score)
-                    days_per_country[country] += additional_days
-                    remaining_days -= additional_days
-            
-            sorted_countries = sorted(
-                countries,
-                key=lambda x: (interest_scores[x], -days_per_country[x]),
-                reverse=True
-            )
-            
-            for country in sorted_countries:
-                if remaining_days > 0:
-                    days_per_country[country] += 1
-                    remaining_days -= 1
-                else:
-                    break
+            return {country: base_days for country in countries}
+
+        min_days = 2
+        days = np.full(len(countries), min_days, dtype=np.int64)
+        remaining_days = total_days - int(days.sum())
+        if remaining_days > 0:
+            days += (remaining_days * scores) // total_score
+
+        # Leftover days go to the highest-interest countries first,
+        # preferring the ones that currently have fewer days.
+        leftover = total_days - int(days.sum())
+        if leftover > 0:
+            order = np.lexsort((days, -scores))
+            days[order[:leftover]] += 1
                     
-        return days_per_country
+        return dict(zip(countries, days.tolist()))
 
 class TourPlannerGUI:
     def __init__(self, root):
@@ -103,6 +175,14 @@ class TourPlannerGUI:
         self.root.title("✈️ Global Tour Planner")
         self.country_data = CountryData(country_data)
         self.optimizer = TourOptimizer(self.country_data)
+        # Planning runs off the Tk thread; one worker keeps results in request order
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        # Tk is not thread-safe: finished plans are queued by the worker and
+        # picked up by _poll_results on the Tk thread
+        self.done_plans = queue.Queue()
+        self.closing = False
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.root.after(_POLL_MS, self._poll_results)
         
         style = ttk.Style()
         style.configure('Header.TLabel', font=('Helvetica', 14, 'bold'))
@@ -179,7 +259,7 @@ class TourPlannerGUI:
         ttk.Label(self.input_frame, text="Home Country:", style='Subheader.TLabel').grid(
             row=6, column=0, pady=8, sticky='w')
         self.starting_country = ttk.Combobox(self.input_frame, 
-                                           values=sorted(list(self.country_data.countries_data.keys())))
+                                           values=self.country_data.sorted_names)
         self.starting_country.grid(row=6, column=1, pady=8, sticky='ew')
         
         generate_btn = ttk.Button(self.input_frame, text="Generate Itinerary ✈️", 
@@ -231,54 +311,39 @@ class TourPlannerGUI:
         except ValueError:
             return False
 
-    def get_selected_interests(self) -> Set[str]:
-        return {interest for interest, var in self.interest_vars.items() if var.get()}
+    def get_user_mask(self) -> int:
+        interest_bit = self.country_data.interest_bit
+        mask = 0
+        for interest, var in self.interest_vars.items():
+            if var.get():
+                mask |= interest_bit[interest]
+        return mask
 
-    def calculate_minimum_trip_cost(self, selected_countries: List[str], home_country: str) -> float:
-        min_total_cost = 0
-        min_days_per_country = 2
-        
-        for country in selected_countries:
-            country_data = self.country_data.countries_data[country]
-            min_total_cost += country_data["avg_travel_cost"]
-            min_total_cost += country_data["avg_accommodation_cost"] * min_days_per_country
-        
-        if selected_countries:
-            last_country = selected_countries[-1]
-            min_total_cost += self.country_data.countries_data[last_country]["avg_travel_cost"]
-        
-        return min_total_cost
+    def calculate_minimum_trip_cost(self, selected_countries: List[str], home_country: str) -> int:
+        """Cheapest possible trip: 2 days per country plus the flight home (see calculate_total_cost)"""
+        if not selected_countries:
+            return 0
+        cd = self.country_data
+        idx = np.array([cd.index[c] for c in selected_countries], dtype=np.int64)
+        return int(cd.min_cost[idx].sum(dtype=np.int64) + cd.travel_cost[cd.index[home_country]])
 
     def suggest_alternative_plan(self, budget: float, selected_countries: List[str], 
-                               home_country: str, selected_interests: Set[str]) -> Tuple[List[str], str]:
-        countries_with_costs = []
-        
-        for country in selected_countries:
-            country_data = self.country_data.countries_data[country]
-            min_cost = (country_data["avg_travel_cost"] + 
-                       (country_data["avg_accommodation_cost"] * 2))
-            interest_match = len(set(country_data["interests"]) & selected_interests)
-            
-            countries_with_costs.append({
-                'country': country,
-                'min_cost': min_cost,
-                'cost_per_interest': min_cost / interest_match if interest_match else float('inf'),
-                'interest_match': interest_match
-            })
-        
-        countries_with_costs.sort(key=lambda x: x['cost_per_interest'])
-        
-        remaining_budget = budget
-        feasible_countries = []
+                               home_country: str, user_mask: int) -> Tuple[List[str], str]:
+        cd = self.country_data
+        idx = np.array([cd.index[c] for c in selected_countries], dtype=np.int64)
+        min_costs = cd.min_cost[idx].astype(np.int64)
+        interest_match = cd.match_counts(idx, user_mask)
+        with np.errstate(divide='ignore'):
+            cost_per_interest = np.where(interest_match > 0, min_costs / np.maximum(interest_match, 1), np.inf)
+        
+        # Cheapest-per-interest first; the walk stops at the first country that does not fit
+        order = np.argsort(cost_per_interest, kind='stable')
+        affordable = np.cumsum(min_costs[order]) <= budget
+        n_fit = len(order) if affordable.all() else int(np.argmin(affordable))
+        
+        feasible_countries = [selected_countries[i] for i in order[:n_fit].tolist()]
         message = "Alternative plan suggestions:\n\n"
         
-        for country_data in countries_with_costs:
-            if remaining_budget >= country_data['min_cost']:
-                feasible_countries.append(country_data['country'])
-                remaining_budget -= country_data['min_cost']
-            else:
-                break
-        
         if not feasible_countries:
             message += "⚠️ Your budget is too low for any of the selected countries.\n"
             message += "Consider:\n"
@@ -286,14 +351,13 @@ class TourPlannerGUI:
             message += "2. Looking for cheaper destinations\n"
             message += "3. Planning a shorter trip\n"
         else:
-            excluded_countries = set(selected_countries) - set(feasible_countries)
+            feasible_mask = np.zeros(len(selected_countries), dtype=bool)
+            feasible_mask[order[:n_fit]] = True
+            excluded = np.flatnonzero(~feasible_mask)
             message += f"✓ You can visit {len(feasible_countries)} out of {len(selected_countries)} selected countries.\n\n"
             message += "Countries removed to meet budget:\n"
-            for country in excluded_countries:
-                country_data = self.country_data.countries_data[country]
-                min_cost = (country_data["avg_travel_cost"] + 
-                           (country_data["avg_accommodation_cost"] * 2))
-                message += f"• {country} (minimum cost: ${min_cost:,})\n"
+            for i, min_cost in zip(excluded.tolist(), min_costs[excluded].tolist()):
+                message += f"• {selected_countries[i]} (minimum cost: ${min_cost:,})\n"
             
             message += "\nSuggestions to include more countries:\n"
             message += "1. Reduce stay duration in each country\n"
@@ -303,131 +367,265 @@ class TourPlannerGUI:
         
         return feasible_countries, message
 
-    def select_countries(self, interests: Set[str], num_countries: int, 
+    def select_countries(self, user_mask: int, num_countries: int, 
                     home_country: str, budget: float) -> List[str]:
         """Select countries based on interests and strict budget adherence"""
-        country_scores = {}
-        for country, data in self.country_data.countries_data.items():
-            if country != home_country:
-                matching_interests = len(set(data["interests"]) & interests)
-                if matching_interests > 0:
-                    min_cost = data["avg_travel_cost"] + (data["avg_accommodation_cost"] * 2)  
-                    country_scores[country] = {
-                        'score': matching_interests,
-                        'min_cost': min_cost,
-                        'cost_per_interest': min_cost / matching_interests
-                    }
+        cd = self.country_data
+        scores = cd.match_counts(slice(None), user_mask)
+        scores[cd.index[home_country]] = 0
+        candidates = np.flatnonzero(scores > 0)
+        file_pos = cd.file_pos[candidates]
+        scores = scores[candidates]
+        min_costs = cd.min_cost[candidates].astype(np.int64)
+        cost_per_interest = min_costs / scores
         
         working_budget = budget * 0.9
         
-        max_return_cost = max(self.country_data.countries_data[c]["avg_travel_cost"] 
-                             for c in self.country_data.countries_data)
+        # The flight home is priced at the home country, like every other leg
+        return_cost = int(cd.travel_cost[cd.index[home_country]])
         
-        working_budget -= max_return_cost
+        working_budget -= return_cost
         
-        sorted_countries = sorted(
-            country_scores.items(),
-            key=lambda x: (-x[1]['score'], x[1]['cost_per_interest'])
-        )
+        # Rank by (-score, cost_per_interest). Usually only the first few ranked
+        # candidates are needed, so partition out the top slots (plus anything
+        # tied with the last of them) and sort just those; the rest are only
+        # sorted if the greedy pass below has to skip over some.
+        slots = num_countries - 1
+        if slots <= 0 or not len(candidates):
+            return []
+        key = -scores + cost_per_interest / (cost_per_interest.max() + 1)
+        if slots < len(candidates):
+            kth = key[np.argpartition(key, slots - 1)[slots - 1]]
+            head = key <= kth
+        else:
+            head = np.ones(len(candidates), dtype=bool)
         
         selected = []
         total_cost = 0
         
-        for country, data in sorted_countries:
-            if len(selected) >= num_countries - 1:
-                break
+        for part in (np.flatnonzero(head), np.flatnonzero(~head)):
+            order = part[np.lexsort((file_pos[part], cost_per_interest[part], -scores[part]))]
+            for i in order.tolist():
+                if len(selected) >= slots:
+                    return selected
+                    
+                new_total = total_cost + int(min_costs[i])
                 
-            new_total = total_cost + data['min_cost']
-            
-            if new_total <= working_budget:
-                selected.append(country)
-                total_cost = new_total
+                if new_total <= working_budget:
+                    selected.append(cd.names[candidates[i]])
+                    total_cost = new_total
             
         return selected
 
+    def fit_to_budget(self, countries: List[str], home_country: str, total_days: int, budget: float,
+                      user_mask: int) -> List[str]:
+        """Pick the highest-interest subset of countries that fits the budget without re-routing"""
+        cd = self.country_data
+        idx = np.array([cd.index[c] for c in countries], dtype=np.int64)
+        accom = cd.accom_cost[idx]
+        return_cost = int(cd.travel_cost[cd.index[home_country]])
+        budget = int(budget)
+        best, best_score = countries[:1], -1
+
+        # Only the 2-day minimum is part of each country's knapsack weight, so
+        # the flight home is reserved up front and the extra days at their
+        # worst case.
+        # Capping the accommodation cost of eligible countries keeps that
+        # reserve tight instead of pricing every extra day at the dearest stop.
+        for cap in np.unique(accom).tolist():
+            eligible = np.flatnonzero(accom <= cap)
+            chosen, score = self._knapsack_select(
+                [countries[i] for i in eligible], budget, user_mask,
+                lambda k: return_cost + max(total_days - 2 * k, 0) * cap)
+            if score > best_score:
+                best, best_score = chosen, score
+
+        return best
+
+    def _knapsack_select(self, countries: List[str], budget: int, user_mask: int,
+                         reserve) -> Tuple[List[str], int]:
+        cd = self.country_data
+        n = len(countries)
+        idx = np.array([cd.index[c] for c in countries], dtype=np.int64)
+        costs = (cd.travel_cost[idx] + cd.accom_cost[idx] * 2).astype(np.int64)
+        scores = cd.match_counts(idx, user_mask).tolist()
+
+        # Every subset total is a multiple of the costs' gcd, so working in
+        # units of it is exact and keeps the table small.
+        unit = int(np.gcd.reduce(costs))
+        costs = (costs // unit).tolist()
+
+        # dp[k, w]: best interest score using exactly k countries whose
+        # minimum stays cost at most w units.
+        W = max(min(budget // unit, sum(costs)), 0)
+        dp = np.full((n + 1, W + 1), -1, dtype=np.int32)
+        dp[0, :] = 0
+        take = np.zeros((n, n + 1, W + 1), dtype=bool)
+        for i in range(n):
+            cost, score = costs[i], scores[i]
+            if cost > W:
+                continue
+            for k in range(i + 1, 0, -1):
+                prev = dp[k - 1, :W + 1 - cost]
+                cand = np.where(prev >= 0, prev + score, -1)
+                better = cand > dp[k, cost:]
+                dp[k, cost:][better] = cand[better]
+                take[i, k, cost:] = better
+
+        best_k, best_w, best_score = 0, 0, -1
+        for k in range(1, n + 1):
+            w = min((budget - reserve(k)) // unit, W)
+            if w >= 0 and dp[k, w] >= 0 and dp[k, w] >= best_score:
+                best_k, best_w, best_score = k, w, int(dp[k, w])
+
+        chosen = set()
+        k, w = best_k, best_w
+        for i in range(n - 1, -1, -1):
+            if k > 0 and take[i, k, w]:
+                chosen.add(i)
+                k -= 1
+                w -= costs[i]
+        return [c for i, c in enumerate(countries) if i in chosen], best_score
+
     def generate_itinerary(self):
         try:
             num_countries = int(self.num_countries.get())
-            selected_interests = self.get_selected_interests()
+            user_mask = self.get_user_mask()
             budget = float(self.budget.get())
             home_country = self.starting_country.get()
             
-            if not selected_interests or not home_country:
+            if not user_mask or not home_country:
                 messagebox.showerror("Error", "Please fill in all required fields")
                 return
             
-            selected_countries = self.select_countries(
-                selected_interests, 
-                num_countries, 
-                home_country,
-                budget
-            )
-            
-            if not selected_countries:
-                messagebox.showwarning(
-                    "Budget Constraint",
-                    "Your budget is too low to visit any countries.\n\n" +
-                    "Please either:\n" +
-                    "1. Increase your budget\n" +
-                    "2. Consider alternative destinations\n" +
-                    "3. Plan a shorter trip"
-                )
+            # The Combobox accepts free text; everything downstream indexes by home country
+            if home_country not in self.country_data.index:
+                messagebox.showerror("Error", f"Unknown starting country: {home_country}")
                 return
             
-            route = self.optimizer.solve_tsp(selected_countries, home_country)
-            start_date = datetime.strptime(self.start_date.get(), '%m/%d/%y')
-            end_date = datetime.strptime(self.end_date.get(), '%m/%d/%y')
-            total_days = (end_date - start_date).days + 1
-            
-            days_distribution = self.optimizer.distribute_days(total_days, route, selected_interests)
-            
-            total_cost = self.calculate_total_cost(route, days_distribution)
-            
-            if total_cost > budget:
-                while total_cost > budget and len(selected_countries) > 1:
-                    selected_countries.pop()
-                    route = self.optimizer.solve_tsp(selected_countries, home_country)
-                    days_distribution = self.optimizer.distribute_days(total_days, route, selected_interests)
-                    total_cost = self.calculate_total_cost(route, days_distribution)
-            
-            self.display_itinerary(route, days_distribution, start_date, budget, home_country)
-            
         except ValueError as e:
             messagebox.showerror("Error", str(e))
+            return
+        
+        # DateEntry already holds a datetime.date; no need to round-trip through its text
+        start_date = self.start_date.get_date()
+        total_days = (self.end_date.get_date() - start_date).days + 1
+        
+        future = self.executor.submit(self._compute_itinerary, num_countries, user_mask,
+                                      budget, home_country, total_days)
+        future.add_done_callback(
+            lambda f: self.done_plans.put((f, start_date, budget, home_country)))
     
-    def calculate_total_cost(self, route: List[str], 
-                            days_distribution: Dict[str, int]) -> float:
-        """Calculate total cost of the itinerary"""
-        total_cost = 0
+    def _compute_itinerary(self, num_countries: int, user_mask: int, budget: float,
+                           home_country: str, total_days: int):
+        """Worker-thread half of generate_itinerary: no Tk calls allowed here"""
+        selected_countries = self.select_countries(
+            user_mask, 
+            num_countries, 
+            home_country,
+            budget
+        )
         
-        for country in route[1:-1]:
-            country_data = self.country_data.countries_data[country]
-            days = days_distribution[country]
-            travel_cost = country_data["avg_travel_cost"]
-            accommodation_cost = country_data["avg_accommodation_cost"] * days
-            total_cost += travel_cost + accommodation_cost
+        if not selected_countries:
+            return None
+        
+        route = self.optimizer.solve_tsp(selected_countries, home_country)
+        days_distribution = self.optimizer.distribute_days(total_days, route, user_mask)
+        
+        total_cost = self.calculate_total_cost(route, days_distribution)
         
-        last_country = route[-2]
-        last_country_data = self.country_data.countries_data[last_country]
-        total_cost += last_country_data["avg_travel_cost"]
+        if total_cost > budget:
+            selected_countries = self.fit_to_budget(
+                selected_countries, home_country, total_days, budget, user_mask)
+            route = self.optimizer.solve_tsp(selected_countries, home_country)
+            days_distribution = self.optimizer.distribute_days(total_days, route, user_mask)
         
-        return total_cost
+        return route, days_distribution
+    
+    def _render_itinerary(self, future: Future, start_date: date, budget: float,
+                          home_country: str):
+        """Main-thread half of generate_itinerary, called from _poll_results"""
+        try:
+            result = future.result()
+        except Exception as e:  # anything raised on the worker lands here
+            messagebox.showerror("Error", str(e))
+            return
+        
+        if result is None:
+            messagebox.showwarning(
+                "Budget Constraint",
+                "Your budget is too low to visit any countries.\n\n" +
+                "Please either:\n" +
+                "1. Increase your budget\n" +
+                "2. Consider alternative destinations\n" +
+                "3. Plan a shorter trip"
+            )
+            return
+        
+        route, days_distribution = result
+        self.display_itinerary(route, days_distribution, start_date, budget, home_country)
+    
+    def _poll_results(self):
+        """Render every finished plan, then check again in _POLL_MS"""
+        if self.closing:
+            return
+        while True:
+            try:
+                plan = self.done_plans.get_nowait()
+            except queue.Empty:
+                break
+            self._render_itinerary(*plan)
+        self.root.after(_POLL_MS, self._poll_results)
+    
+    def on_close(self):
+        """Drop queued plans and stop the worker before closing the window"""
+        # A plan still running only puts its result on the queue, which
+        # nothing reads once closing is set
+        self.closing = True
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.root.destroy()
+    
+    def calculate_total_cost(self, route: List[str], 
+                            days_distribution: Dict[str, int]) -> int:
+        """
+        Calculate total cost of the itinerary.
+
+        Cost model: each visited stop costs its avg_travel_cost (the flight in)
+        plus avg_accommodation_cost per day, and the trip ends with one flight
+        into the home country, priced at the home country's avg_travel_cost.
+        """
+        assert route[0] == route[-1], "route must start and end at home"
+        index = self.country_data.index
+        stops = route[1:-1]
+        idx = np.array([index[c] for c in stops], dtype=np.int64)
+        days = np.array([days_distribution[c] for c in stops], dtype=np.int64)
+        travel = self.country_data.travel_cost
+        return int(travel[idx].sum(dtype=np.int64) + (self.country_data.accom_cost[idx] * days).sum()
+                   + travel[index[route[-1]]])
 
     def display_itinerary(self, route: List[str], days_distribution: Dict[str, int], 
-                     start_date: datetime, budget: float, home_country: str):
+                     start_date: date, budget: float, home_country: str):
         """Display the generated itinerary with enhanced budget information"""
         self.result_text.delete(1.0, tk.END)
+        parts = []
         
         total_cost = 0
-        current_date = start_date
+        stops = route[1:-1]
+        
+        # Format every stop's date range in one pass before building the text
+        offsets = np.cumsum([0] + [days_distribution[country] for country in stops]).tolist()
+        date_ranges = [
+            (start_date + timedelta(days=offsets[i])).strftime(_DATE_FMT) + " - " +
+            (start_date + timedelta(days=offsets[i + 1] - 1)).strftime(_DATE_FMT)
+            for i in range(len(stops))
+        ]
         
-        total_days = sum(days_distribution.values())
+        total_days = offsets[-1]
         
-        self.result_text.insert(tk.END, "=== Your Travel Itinerary ===\n\n")
+        parts.append("=== Your Travel Itinerary ===\n\n")
         
-        for i, country in enumerate(route[1:-1]):  
+        for i, country in enumerate(stops):  
             days = days_distribution[country]
-            end_date = current_date + timedelta(days=days-1)
             
             country_data = self.country_data.countries_data[country]
             travel_cost = country_data["avg_travel_cost"]
@@ -435,63 +633,52 @@ class TourPlannerGUI:
             
             total_cost += travel_cost + accommodation_cost
             
-            self.result_text.insert(tk.END, f"📍 {country}\n")
-            self.result_text.insert(tk.END, 
-                f"   Dates: {current_date.strftime('%B %d')} - {end_date.strftime('%B %d')}\n")
-            self.result_text.insert(tk.END, f"   Travel Cost: ${travel_cost:,}\n")
-            self.result_text.insert(tk.END, f"   Accommodation: ${accommodation_cost:,}\n")
-            self.result_text.insert(tk.END, f"   Duration: {days} days\n")
-            self.result_text.insert(tk.END, f"   Interests: {', '.join(country_data['interests'])}\n\n")
-            
-            current_date = end_date + timedelta(days=1)
-        
-        last_country = route[-2]
-        last_country_data = self.country_data.countries_data[last_country]
-        last_travel_cost = last_country_data["avg_travel_cost"]
+            parts.append(f"📍 {country}\n")
+            parts.append(f"   Dates: {date_ranges[i]}\n")
+            parts.append(f"   Travel Cost: ${travel_cost:,}\n")
+            parts.append(f"   Accommodation: ${accommodation_cost:,}\n")
+            parts.append(f"   Duration: {days} days\n")
+            parts.append(f"   Interests: {', '.join(country_data['interests'])}\n\n")
+        
+        last_travel_cost = self.country_data.countries_data[home_country]["avg_travel_cost"]
         total_cost += last_travel_cost
         
-        self.result_text.insert(tk.END, f"📍 {home_country} \n")
-        self.result_text.insert(tk.END, f"   Travel Cost: ${last_travel_cost:,}\n\n")
+        parts.append(f"📍 {home_country} \n")
+        parts.append(f"   Travel Cost: ${last_travel_cost:,}\n\n")
         
-        self.result_text.insert(tk.END, "🗺️ Complete Route:\n")
+        parts.append("🗺️ Complete Route:\n")
         route_str = " ➔ ".join(route)
-        self.result_text.insert(tk.END, f"{route_str}\n\n")
+        parts.append(f"{route_str}\n\n")
         
-        self.result_text.insert(tk.END, "💰 Financial Summary:\n")
+        parts.append("💰 Financial Summary:\n")
         daily_cost = total_cost / total_days
-        self.result_text.insert(tk.END, f"Total Cost: ${total_cost:,}\n")
-        self.result_text.insert(tk.END, f"Average Daily Cost: ${daily_cost:.2f}\n")
+        parts.append(f"Total Cost: ${total_cost:,}\n")
+        parts.append(f"Average Daily Cost: ${daily_cost:.2f}\n")
         remaining_budget = budget - total_cost
         budget_per_day = budget / total_days
         
         if remaining_budget < 0:
-            self.result_text.insert(tk.END, 
-                f"\n⚠️ Warning: Itinerary exceeds budget by ${abs(remaining_budget):,.2f}\n")
-            self.result_text.insert(tk.END,
-                "Budget Management Suggestions:\n")
-            self.result_text.insert(tk.END,
-                "1. Consider reducing stay duration in more expensive countries\n")
-            self.result_text.insert(tk.END,
-                "2. Look for alternative accommodation options\n")
-            self.result_text.insert(tk.END,
-                "3. Consider visiting fewer countries\n")
-            self.result_text.insert(tk.END,
-                f"4. Additional budget needed per day: ${abs(remaining_budget/total_days):.2f}\n")
+            parts.append(f"\n⚠️ Warning: Itinerary exceeds budget by ${abs(remaining_budget):,.2f}\n")
+            parts.append("Budget Management Suggestions:\n")
+            parts.append("1. Consider reducing stay duration in more expensive countries\n")
+            parts.append("2. Look for alternative accommodation options\n")
+            parts.append("3. Consider visiting fewer countries\n")
+            parts.append(f"4. Additional budget needed per day: ${abs(remaining_budget/total_days):.2f}\n")
         else:
-            self.result_text.insert(tk.END, 
-                f"\n✨ Remaining Budget: ${remaining_budget:,.2f}\n")
-            self.result_text.insert(tk.END,
-                f"Additional spending available per day: ${remaining_budget/total_days:.2f}\n")
+            parts.append(f"\n✨ Remaining Budget: ${remaining_budget:,.2f}\n")
+            parts.append(f"Additional spending available per day: ${remaining_budget/total_days:.2f}\n")
             
         budget_utilization = (total_cost / budget) * 100
-        self.result_text.insert(tk.END, f"\n📊 Budget Utilization: {budget_utilization:.1f}%\n")
+        parts.append(f"\n📊 Budget Utilization: {budget_utilization:.1f}%\n")
         
         if 85 <= budget_utilization <= 100:
-            self.result_text.insert(tk.END, "\n💡 Cost-Saving Opportunities:\n")
-            self.result_text.insert(tk.END, "• Consider hostels or guesthouses in expensive destinations\n")
-            self.result_text.insert(tk.END, "• Look for flight deals or alternative travel dates\n")
-            self.result_text.insert(tk.END, "• Research free activities and attractions\n")
-            self.result_text.insert(tk.END, "• Consider local transportation options\n")
+            parts.append("\n💡 Cost-Saving Opportunities:\n")
+            parts.append("• Consider hostels or guesthouses in expensive destinations\n")
+            parts.append("• Look for flight deals or alternative travel dates\n")
+            parts.append("• Research free activities and attractions\n")
+            parts.append("• Consider local transportation options\n")
+
+        self.result_text.insert(tk.END, "".join(parts))
             
 
 if __name__ == "__main__":
@@ -13,7 +13,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
 
-from backend.config import CORS_ORIGINS, API_HOST, API_PORT
+from backend.config import CORS_ORIGINS, API_HOST, API_PORT, API_RELOAD
 from backend.routes.itinerary import router as itinerary_router
 
 # ─── App Setup ────────────────────────────────────────────────────
@@ -52,10 +52,16 @@ async def health_check():
 # ─── Direct Run ───────────────────────────────────────────────────
 
 if __name__ == "__main__":
+    from importlib.util import find_spec
+
     import uvicorn
+
+    # uvloop/httptools ship with uvicorn[standard] (uvloop is unavailable on Windows)
     uvicorn.run(
         "backend.app:app",
         host=API_HOST,
         port=API_PORT,
-        reload=True,
+        loop="uvloop" if find_spec("uvloop") else "asyncio",
+        http="httptools" if find_spec("httptools") else "h11",
+        reload=API_RELOAD,
     )
@@ -16,6 +16,9 @@ MIN_DAYS_PER_COUNTRY = 2
 MAX_COUNTRIES = 15
 BUDGET_SAFETY_MARGIN = 0.9  # Reserve 10% of budget as safety buffer
 TSP_2OPT_MAX_ITERATIONS = 100  # Max improvement iterations for 2-opt
+TSP_OR_OPT_MAX_ITERATIONS = 100  # Max chain relocations for the Or-opt polish
+TSP_MULTISTART = 8  # Nearest Neighbor seeds per solve (home + most central stops)
+TSP_CACHE_SIZE = 256  # Solved tours kept per optimizer, keyed on (country set, home)
 
 # Earth radius in kilometers (for Haversine)
 EARTH_RADIUS_KM = 6371.0
@@ -24,3 +27,4 @@ EARTH_RADIUS_KM = 6371.0
 API_HOST = os.getenv("API_HOST", "127.0.0.1")
 API_PORT = int(os.getenv("API_PORT", "8000"))
 CORS_ORIGINS = os.getenv("CORS_ORIGINS", "*").split(",")
+API_RELOAD = os.getenv("API_RELOAD", "0").lower() in ("1", "true", "yes")
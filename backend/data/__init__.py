@@ -4,27 +4,115 @@ Loads and validates the country database.
 """
 
 import json
+from collections.abc import Mapping
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # optional accelerator; stdlib json is the fallback
+    orjson = None
 
 from backend.config import COUNTRIES_FILE
 
 
-def load_countries(filepath: Path = None) -> Dict:
+@dataclass(eq=False)
+class CountryDB(Mapping):
+    """
+    Parsed country database.
+
+    Behaves like the raw ``{name: info}`` dict (so existing lookups keep
+    working) and additionally exposes struct-of-arrays views aligned with
+    ``names`` for vectorized consumers.
+    """
+
+    records: Dict[str, Dict]
+    names: List[str]
+    name_to_idx: Dict[str, int]
+    coords: np.ndarray          # (N, 2) float64 — [lat, lng]
+    travel_cost: np.ndarray     # (N,) int32 — whole USD
+    accom_cost: np.ndarray      # (N,) int32 — whole USD per day
+    interest_masks: np.ndarray  # (N,) uint64 — bit i set if interest_names[i] matches
+    interest_names: List[str]
+
+    def __post_init__(self):
+        self._interest_bits = {name: 1 << i for i, name in enumerate(self.interest_names)}
+
+    def __getitem__(self, country: str) -> Dict:
+        return self.records[country]
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def interest_mask(self, interests: Iterable[str]) -> int:
+        """Encode a collection of interests as a bitmask (unknown ones are ignored)."""
+        mask = 0
+        for interest in interests:
+            if interest in self._interest_bits:
+                mask |= self._interest_bits[interest]
+        return mask
+
+    @classmethod
+    def from_records(cls, data: Dict[str, Dict]) -> "CountryDB":
+        names = list(data)
+        interest_names = sorted({i for info in data.values() for i in info["interests"]})
+        if len(interest_names) > 64:
+            raise ValueError(
+                f"Too many distinct interests ({len(interest_names)}) for a 64-bit mask"
+            )
+        bits = {name: 1 << i for i, name in enumerate(interest_names)}
+
+        return cls(
+            records=data,
+            names=names,
+            name_to_idx={name: i for i, name in enumerate(names)},
+            coords=np.array([data[n]["coordinates"] for n in names], dtype=np.float64),
+            travel_cost=np.fromiter(
+                (data[n]["avg_travel_cost"] for n in names), dtype=np.int32, count=len(names)
+            ),
+            accom_cost=np.fromiter(
+                (data[n]["avg_accommodation_cost"] for n in names), dtype=np.int32, count=len(names)
+            ),
+            interest_masks=np.fromiter(
+                (sum(bits[i] for i in set(data[n]["interests"])) for n in names),
+                dtype=np.uint64, count=len(names)
+            ),
+            interest_names=interest_names,
+        )
+
+
+def load_countries(filepath: Optional[Union[str, Path]] = None) -> CountryDB:
     """
     Load country data from JSON file.
 
+    Parsed databases are memoized per path, so repeated calls (one per
+    service, or per request) share a single CountryDB instead of re-reading
+    and re-validating the file.
+
     Args:
         filepath: Optional custom path. Defaults to config COUNTRIES_FILE.
 
     Returns:
-        Dictionary of country data
+        CountryDB — mapping of country name to its data, with
+        NumPy arrays for coordinates, costs, and interest masks
 
     Raises:
         FileNotFoundError: If the data file doesn't exist
         ValueError: If the JSON is malformed or missing required fields
     """
-    path = filepath or COUNTRIES_FILE
+    return _load_countries_cached(str(filepath or COUNTRIES_FILE))
+
+
+@lru_cache(maxsize=4)
+def _load_countries_cached(filepath: str) -> CountryDB:
+    path = Path(filepath)
 
     if not path.exists():
         raise FileNotFoundError(
@@ -32,8 +120,12 @@ def load_countries(filepath: Path = None) -> Dict:
             f"Expected enriched countries.json in backend/data/"
         )
 
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    if orjson is not None:
+        with open(path, "rb") as f:
+            data = orjson.loads(f.read())
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
 
     # Validate structure
     required_fields = {"interests", "avg_travel_cost", "avg_accommodation_cost", "coordinates"}
@@ -50,4 +142,13 @@ def load_countries(filepath: Path = None) -> Dict:
                 f"Country '{country}' has invalid coordinates: {info['coordinates']}"
             )
 
-    return data
+        # Costs are packed into int32 arrays, which would silently truncate
+        # fractional dollars
+        for field in ("avg_travel_cost", "avg_accommodation_cost"):
+            value = info[field]
+            if not isinstance(value, int) or isinstance(value, bool):
+                raise ValueError(
+                    f"Country '{country}' has non-integer {field}: {value!r}"
+                )
+
+    return CountryDB.from_records(data)
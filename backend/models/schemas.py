@@ -3,8 +3,9 @@ Pydantic schemas for request/response validation.
 Phase 3: Added intelligence fields (season, currency, visa, recommendations).
 """
 
-from pydantic import BaseModel, Field, field_validator
-from typing import List, Set, Optional, Dict
+from dataclasses import dataclass
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints, field_validator
+from typing import Annotated, List, Literal, FrozenSet, Set, Optional, Dict
 from datetime import date
 
 
@@ -13,7 +14,10 @@ from datetime import date
 class ItineraryRequest(BaseModel):
     """Request body for generating a travel itinerary."""
 
-    home_country: str = Field(
+    model_config = ConfigDict(extra="forbid")
+
+    # Stripped inside pydantic-core, so no Python validator runs for it
+    home_country: Annotated[str, StringConstraints(strip_whitespace=True)] = Field(
         ...,
         description="User's home/starting country",
         examples=["India"]
@@ -24,10 +28,10 @@ class ItineraryRequest(BaseModel):
         le=15,
         description="Number of countries to visit (1-15)"
     )
-    interests: List[str] = Field(
+    interests: FrozenSet[str] = Field(
         ...,
         min_length=1,
-        description="List of travel interests",
+        description="Travel interests (duplicates are ignored)",
         examples=[["culture", "food", "beaches"]]
     )
     budget: float = Field(
@@ -51,24 +55,25 @@ class ItineraryRequest(BaseModel):
             raise ValueError("end_date must be after start_date")
         return v
 
-    @field_validator("home_country")
-    @classmethod
-    def normalize_country(cls, v):
-        return v.strip()
-
 
 # ─── Intelligence Sub-schemas ─────────────────────────────────────
+# Leaf types are plain frozen, slotted dataclasses: pydantic still validates
+# and serializes them as fields of the models below, but each instance is a
+# few slots instead of a BaseModel's __dict__ + fields-set bookkeeping, and
+# building one from trusted service output runs no validation at all.
 
-class SeasonInfo(BaseModel):
+@dataclass(frozen=True, slots=True)
+class SeasonInfo:
     """Season awareness data for a stop."""
     is_best_season: bool = True
-    season_rating: str = "ideal"  # "ideal" | "partial" | "off-season"
+    season_rating: Literal["ideal", "partial", "off-season"] = "ideal"
     best_months: str = ""
     warning: Optional[str] = None
     tip: Optional[str] = None
 
 
-class CurrencyInfo(BaseModel):
+@dataclass(frozen=True, slots=True)
+class CurrencyInfo:
     """Currency conversion data for a stop."""
     currency_code: str = "USD"
     exchange_rate: float = 1.0
@@ -76,7 +81,8 @@ class CurrencyInfo(BaseModel):
     formatted: str = ""
 
 
-class SpendingGuide(BaseModel):
+@dataclass(frozen=True, slots=True)
+class SpendingGuide:
     """Daily spending breakdown in local currency."""
     currency_code: str = "USD"
     daily_accommodation_local: float = 0
@@ -87,23 +93,28 @@ class SpendingGuide(BaseModel):
     total_local: float = 0
 
 
-class VisaInfo(BaseModel):
+@dataclass(frozen=True, slots=True)
+class VisaInfo:
     """Visa requirement for the traveler."""
-    requirement: str = "unknown"
+    requirement: Literal[
+        "home", "visa_free", "visa_on_arrival", "e_visa", "visa_required", "unknown"
+    ] = "unknown"
     label: str = "Check Requirements"
-    color: str = "gray"
+    color: Literal["blue", "green", "yellow", "red", "gray"] = "gray"
     note: str = ""
 
 
-class ActivitySuggestion(BaseModel):
+@dataclass(frozen=True, slots=True)
+class ActivitySuggestion:
     """A suggested activity for a destination."""
     name: str
     duration: str
-    priority: str = "medium"
+    priority: Literal["low", "medium", "high"] = "medium"
     interest: str = ""
 
 
-class CityRecommendation(BaseModel):
+@dataclass(frozen=True, slots=True)
+class CityRecommendation:
     """A recommended city to visit."""
     name: str
     suggested_days: int = 1
@@ -5,9 +5,9 @@ REST endpoints for generating and querying travel itineraries
 with season awareness, currency conversion, visa info, and recommendations.
 """
 
-from fastapi import APIRouter, HTTPException
-from datetime import datetime, timedelta, date
-from typing import Set
+from fastapi import APIRouter, HTTPException, Response
+from pydantic import TypeAdapter
+from datetime import date, timedelta
 
 from backend.models.schemas import (
     ItineraryRequest,
@@ -29,11 +29,38 @@ from backend.models.schemas import (
 from backend.services.optimizer import TourOptimizer
 from backend.services.country_selector import CountrySelector
 from backend.services.budget import BudgetService
-from backend.services.intelligence import IntelligenceService, get_visa_info
+from backend.services.intelligence import IntelligenceService
 from backend.data import load_countries
 
 router = APIRouter(prefix="/api", tags=["itinerary"])
 
+
+_MONTHS = (
+    "", "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+)
+
+
+def _format_date(d: date) -> str:
+    """Format as 'June 01, 2026' (same as strftime("%B %d, %Y") in the C locale)."""
+    return f"{_MONTHS[d.month]} {d.day:02d}, {d.year}"
+
+
+# Built once: the serializer for the hot response, reused by every request
+_ITINERARY_ADAPTER = TypeAdapter(ItineraryResponse)
+
+
+def _json_response(resp: ItineraryResponse) -> Response:
+    """
+    Serialize an already-built itinerary straight to JSON bytes.
+
+    The route is declared with response_model=None, so FastAPI neither
+    re-validates nor re-encodes the result; the models here are built by
+    this module, so checking them a second time is pure overhead.
+    """
+    return Response(content=_ITINERARY_ADAPTER.dump_json(resp), media_type="application/json")
+
+
 # Load data and initialize services
 countries_data = load_countries()
 optimizer = TourOptimizer(countries_data)
@@ -41,15 +68,14 @@ selector = CountrySelector(countries_data)
 budget_service = BudgetService(countries_data)
 intelligence = IntelligenceService(countries_data)
 
+# Listed in the 400 for an unknown home country; joined once, not per bad request
+_ALL_COUNTRIES_MSG = ", ".join(sorted(countries_data.keys()))
 
-@router.get("/countries", response_model=AvailableDataResponse)
-async def get_available_countries():
-    """Get all available countries and interests for the frontend."""
-    all_interests = sorted(list(set(
-        interest
-        for data in countries_data.values()
-        for interest in data["interests"]
-    )))
+
+def _build_available_data(countries_data) -> AvailableDataResponse:
+    """Build the /countries payload (static for the lifetime of the process)."""
+    # CountryDB already keeps the distinct interests, sorted
+    all_interests = list(countries_data.interest_names)
 
     country_list = [
         CountryInfo(
@@ -74,7 +100,77 @@ async def get_available_countries():
     )
 
 
-@router.post("/generate-itinerary", response_model=ItineraryResponse)
+# The country list never changes at runtime, so it is validated and
+# serialized once; the endpoint just hands back the bytes.
+_AVAILABLE_DATA_JSON = _build_available_data(countries_data).model_dump_json().encode()
+
+
+@router.get("/countries", response_model=AvailableDataResponse)
+async def get_available_countries():
+    """Get all available countries and interests for the frontend."""
+    return Response(content=_AVAILABLE_DATA_JSON, media_type="application/json")
+
+
+def _build_stop(country: str, days: int, costs: dict, stop_range, intel: dict) -> CountryStop:
+    """
+    Assemble one enriched stop.
+
+    Everything here comes from our own data and services, so the whole
+    tree is built without validation: model_construct for the models and
+    plain constructors for the dataclass leaves.
+    Costs are cast explicitly because validation is what used to coerce them.
+    """
+    country_info = countries_data[country]
+    stop_start, stop_end = stop_range
+    season_data = intel["season"]
+    currency_data = intel["currency"]
+    rec_data = intel["recommendations"]
+
+    return CountryStop.model_construct(
+        country=country,
+        flag=country_info.get("flag", ""),
+        days=days,
+        start_date=_format_date(stop_start),
+        end_date=_format_date(stop_end),
+        travel_cost=float(costs["travel_cost"]),
+        accommodation_cost=float(costs["accommodation_cost"]),
+        total_cost=float(costs["total"]),
+        interests=country_info["interests"],
+        coordinates=[float(c) for c in country_info["coordinates"]],
+        best_season=country_info.get("best_season"),
+        safety_score=country_info.get("safety_score"),
+        currency=country_info.get("currency"),
+        top_cities=country_info.get("top_cities", []),
+        season_info=SeasonInfo(
+            is_best_season=season_data["is_best_season"],
+            season_rating=season_data["season_rating"],
+            best_months=season_data["best_months"],
+            warning=season_data["warning"],
+            tip=season_data["tip"],
+        ),
+        currency_info=CurrencyInfo(
+            currency_code=currency_data["currency_code"],
+            exchange_rate=currency_data["exchange_rate"],
+            budget_local=currency_data["budget_local"],
+            formatted=currency_data["formatted"],
+        ),
+        spending_guide=SpendingGuide(**intel["spending"]),
+        visa_info=VisaInfo(**intel["visa"]),
+        recommendations=Recommendations.model_construct(
+            suggested_activities=[ActivitySuggestion(**a) for a in rec_data["suggested_activities"]],
+            recommended_cities=[CityRecommendation(**c) for c in rec_data["recommended_cities"]],
+            packing_tips=rec_data["packing_tips"],
+            matching_interests=rec_data["matching_interests"],
+            interest_match_pct=rec_data["interest_match_pct"],
+        ),
+    )
+
+
+@router.post(
+    "/generate-itinerary",
+    response_model=None,
+    responses={200: {"model": ItineraryResponse}},
+)
 async def generate_itinerary(request: ItineraryRequest):
     """
     Generate an optimized travel itinerary with Phase 3 intelligence.
@@ -92,10 +188,10 @@ async def generate_itinerary(request: ItineraryRequest):
         raise HTTPException(
             status_code=400,
             detail=f"Unknown country: {request.home_country}. "
-                   f"Available: {', '.join(sorted(countries_data.keys()))}"
+                   f"Available: {_ALL_COUNTRIES_MSG}"
         )
 
-    interests: Set[str] = set(request.interests)
+    interests = request.interests
     total_days = (request.end_date - request.start_date).days + 1
 
     if total_days < request.num_countries * 2:
@@ -114,7 +210,7 @@ async def generate_itinerary(request: ItineraryRequest):
     )
 
     if not selected:
-        return ItineraryResponse(
+        return _json_response(ItineraryResponse(
             success=False,
             stops=[],
             route_info=RouteInfo(route=[], route_display="No route", total_distance_km=0),
@@ -128,7 +224,7 @@ async def generate_itinerary(request: ItineraryRequest):
                 cost_saving_tips=["Increase your budget or select different interests"],
             ),
             warnings=["Budget too low for any matching countries"],
-        )
+        ))
 
     # Step 2: Optimize route (TSP + 2-opt)
     route = optimizer.solve_tsp(selected, request.home_country)
@@ -146,12 +242,11 @@ async def generate_itinerary(request: ItineraryRequest):
             home_country=request.home_country,
             budget=request.budget,
             interests=interests,
-            optimizer=optimizer,
         )
         warnings.extend(budget_warnings)
 
         if not selected:
-            return ItineraryResponse(
+            return _json_response(ItineraryResponse(
                 success=False,
                 stops=[],
                 route_info=RouteInfo(route=[], route_display="No route", total_distance_km=0),
@@ -164,111 +259,66 @@ async def generate_itinerary(request: ItineraryRequest):
                     total_days=total_days,
                 ),
                 warnings=warnings,
-            )
+            ))
 
         # Re-route with the reduced set
         route = optimizer.solve_tsp(selected, request.home_country)
         days_distribution = optimizer.distribute_days(total_days, route, interests)
 
     # Step 5: Build enriched response
+    visited = route[1:-1]
+    stop_days = [days_distribution.get(country, 2) for country in visited]
+    stop_costs = [
+        budget_service.calculate_country_cost(country, days)
+        for country, days in zip(visited, stop_days)
+    ]
+
+    # Lay out the calendar first, then fetch every intelligence layer in one batch
+    stop_ranges = []
+    current = request.start_date
+    for days in stop_days:
+        stop_ranges.append((current, current + timedelta(days=days - 1)))
+        current += timedelta(days=days)
+
+    enriched = intelligence.enrich_batch(
+        visited,
+        stop_ranges,
+        [costs["total"] for costs in stop_costs],
+        interests,
+        request.home_country,
+    )
+
     stops = []
     season_alerts = []
     visa_alerts = []
-    current_date = datetime.combine(request.start_date, datetime.min.time())
-
-    for country in route[1:-1]:
-        days = days_distribution.get(country, 2)
-        end_date = current_date + timedelta(days=days - 1)
-        country_info = countries_data[country]
-        costs = budget_service.calculate_country_cost(country, days)
-
-        # ── Intelligence enrichment ──
-        stop_start = current_date.date()
-        stop_end = end_date.date()
-
-        # Season awareness
-        season_data = intelligence.check_season(country, stop_start, stop_end)
-        season_info = SeasonInfo(
-            is_best_season=season_data["is_best_season"],
-            season_rating=season_data["season_rating"],
-            best_months=season_data["best_months"],
-            warning=season_data["warning"],
-            tip=season_data["tip"],
-        )
-        if season_data["warning"]:
-            season_alerts.append(season_data["warning"])
 
-        # Currency conversion
-        per_stop_budget = costs["total"]
-        currency_data = intelligence.get_currency_info(country, per_stop_budget)
-        currency_info = CurrencyInfo(
-            currency_code=currency_data["currency_code"],
-            exchange_rate=currency_data["exchange_rate"],
-            budget_local=currency_data["budget_local"],
-            formatted=currency_data["formatted"],
-        )
+    for country, days, costs, stop_range in zip(visited, stop_days, stop_costs, stop_ranges):
+        intel = enriched[country]
+        stops.append(_build_stop(country, days, costs, stop_range, intel))
 
-        # Spending guide
-        spending_data = intelligence.get_spending_guide(country, days)
-        spending_guide = SpendingGuide(**spending_data)
+        season_warning = intel["season"]["warning"]
+        if season_warning:
+            season_alerts.append(season_warning)
 
-        # Visa info
-        visa_data = get_visa_info(request.home_country, country)
-        visa_info_obj = VisaInfo(**visa_data)
+        visa_data = intel["visa"]
         if visa_data["requirement"] in ("visa_required", "e_visa"):
             visa_alerts.append(f"{country}: {visa_data['label']} — {visa_data['note']}")
 
-        # Recommendations
-        rec_data = intelligence.generate_recommendations(
-            country, interests, days, stop_start
-        )
-        recommendations = Recommendations(
-            suggested_activities=[ActivitySuggestion(**a) for a in rec_data["suggested_activities"]],
-            recommended_cities=[CityRecommendation(**c) for c in rec_data["recommended_cities"]],
-            packing_tips=rec_data["packing_tips"],
-            matching_interests=rec_data["matching_interests"],
-            interest_match_pct=rec_data["interest_match_pct"],
-        )
-
-        stops.append(CountryStop(
-            country=country,
-            flag=country_info.get("flag", ""),
-            days=days,
-            start_date=current_date.strftime("%B %d, %Y"),
-            end_date=end_date.strftime("%B %d, %Y"),
-            travel_cost=costs["travel_cost"],
-            accommodation_cost=costs["accommodation_cost"],
-            total_cost=costs["total"],
-            interests=country_info["interests"],
-            coordinates=country_info["coordinates"],
-            best_season=country_info.get("best_season"),
-            safety_score=country_info.get("safety_score"),
-            currency=country_info.get("currency"),
-            top_cities=country_info.get("top_cities", []),
-            season_info=season_info,
-            currency_info=currency_info,
-            spending_guide=spending_guide,
-            visa_info=visa_info_obj,
-            recommendations=recommendations,
-        ))
-
-        current_date = end_date + timedelta(days=1)
-
     # Final cost recalculation
     final_cost = budget_service.calculate_total_cost(route, days_distribution)
     total_distance = optimizer.get_route_total_distance(route)
     summary = budget_service.generate_summary(final_cost, request.budget, total_days)
 
-    return ItineraryResponse(
+    return _json_response(ItineraryResponse.model_construct(
         success=True,
         stops=stops,
-        route_info=RouteInfo(
+        route_info=RouteInfo.model_construct(
             route=route,
             route_display=" → ".join(route),
             total_distance_km=round(total_distance, 1),
         ),
-        budget_summary=BudgetSummary(**summary),
+        budget_summary=BudgetSummary.model_construct(**summary),
         warnings=warnings,
         season_alerts=season_alerts,
         visa_alerts=visa_alerts,
-    )
+    ))
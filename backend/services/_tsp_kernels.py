@@ -0,0 +1,225 @@
+"""
+Numeric TSP kernels used by TourOptimizer.
+
+Routes are int arrays of country indices into a precomputed distance
+matrix. With Numba installed the scalar loops below are compiled to
+machine code that runs without holding the GIL; without it, vectorized
+NumPy versions with the same signatures and results are used instead
+(interpreted scalar loops would be far slower than either).
+"""
+
+from functools import lru_cache
+from typing import Tuple
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # optional accelerator
+    NUMBA_AVAILABLE = False
+
+
+def _nn_tsp_loop(order: np.ndarray, home: int, countries: np.ndarray) -> np.ndarray:
+    """
+    Nearest Neighbor tour from home through every index in countries.
+
+    order[u] lists every node by increasing distance from u (a stable
+    argsort of the distance matrix), so each step just walks the current
+    node's row to the first stop still pending. Ties go to the lower index.
+    Returns [home, ..., home] as an int64 array; repeated countries and
+    home itself are visited once.
+    """
+    pending = np.zeros(order.shape[0], dtype=np.bool_)
+    n = 0
+    for c in countries:
+        if c != home and not pending[c]:
+            pending[c] = True
+            n += 1
+
+    route = np.empty(n + 2, dtype=np.int64)
+    route[0] = home
+    route[n + 1] = home
+    current = home
+
+    for step in range(n):
+        for c in order[current]:
+            if pending[c]:
+                break
+        pending[c] = False
+        current = c
+        route[step + 1] = current
+
+    return route
+
+
+def _two_opt_loop(D: np.ndarray, route: np.ndarray, max_iter: int, eps: float) -> np.ndarray:
+    """
+    Best-improvement 2-opt on a copy of route (endpoints stay fixed).
+
+    Each iteration applies the single reversal r[i..j] with the most
+    negative delta (first one in (i, j) order on ties), stopping once no
+    reversal gains more than eps or after max_iter moves. Deltas are
+    cached across iterations and only rescored for pairs next to positions
+    the last reversal rewrote, so late iterations mostly re-read the cache.
+    """
+    r = route.copy()
+    n = len(r)
+    edge = np.empty(n - 1, dtype=D.dtype)
+    # delta[i, j] stays valid until a node at position i-1, i, j or j+1
+    # changes; dirty marks positions rewritten by the last reversal
+    delta = np.empty((n, n), dtype=D.dtype)
+    dirty = np.ones(n, dtype=np.bool_)
+    stale = np.empty(n, dtype=np.bool_)
+
+    for _ in range(max_iter):
+        for k in range(n - 1):
+            edge[k] = D[r[k], r[k + 1]]
+            stale[k] = dirty[k] or dirty[k + 1]
+
+        best_i = -1
+        best_j = -1
+        best_delta = np.inf
+        for i in range(1, n - 2):
+            a = r[i - 1]
+            b = r[i]
+            d_ab = edge[i - 1]
+            stale_i = stale[i - 1]
+            for j in range(i + 1, n - 1):
+                if stale_i or stale[j]:
+                    # Reversing r[i..j] only replaces edges (a, b) and
+                    # (r[j], r[j+1]) by (a, r[j]) and (b, r[j+1])
+                    delta[i, j] = D[a, r[j]] + D[b, r[j + 1]] - d_ab - edge[j]
+                if delta[i, j] < best_delta:
+                    best_i = i
+                    best_j = j
+                    best_delta = delta[i, j]
+
+        if best_i < 0 or best_delta >= -eps:
+            break
+
+        dirty[:] = False
+        lo, hi = best_i, best_j
+        dirty[lo:hi + 1] = True
+        while lo < hi:
+            r[lo], r[hi] = r[hi], r[lo]
+            lo += 1
+            hi -= 1
+
+    return r
+
+
+def _or_opt_loop(D: np.ndarray, route: np.ndarray, max_iter: int, eps: float) -> np.ndarray:
+    """
+    Best-improvement Or-opt on a copy of route (endpoints stay fixed).
+
+    Each move cuts a chain of 1-3 consecutive stops out of the tour and
+    reinserts it, forwards or reversed, between two other neighbouring
+    stops; this finds relocations that no single 2-opt reversal can make.
+    Stops once no move gains more than eps or after max_iter moves.
+    """
+    r = route.copy()
+    n = len(r)
+    out = np.empty_like(r)
+
+    for _ in range(max_iter):
+        best_delta = np.inf
+        best_i = -1
+        best_e = -1
+        best_k = -1
+        best_rev = False
+        for seg_len in range(1, 4):
+            for i in range(1, n - seg_len):
+                # Chain r[i..e] sits between p and q; cutting it out saves
+                # edges (p, s0) and (s1, q) and adds the shortcut (p, q)
+                e = i + seg_len - 1
+                p, q, s0, s1 = r[i - 1], r[e + 1], r[i], r[e]
+                removal = D[p, s0] + D[s1, q] - D[p, q]
+                for k in range(n - 1):
+                    if i - 1 <= k <= e:  # edge (k, k+1) touches the chain
+                        continue
+                    u, v = r[k], r[k + 1]
+                    delta = D[u, s0] + D[s1, v] - D[u, v] - removal
+                    if delta < best_delta:
+                        best_delta, best_i, best_e, best_k, best_rev = delta, i, e, k, False
+                    if seg_len > 1:
+                        delta = D[u, s1] + D[s0, v] - D[u, v] - removal
+                        if delta < best_delta:
+                            best_delta, best_i, best_e, best_k, best_rev = delta, i, e, k, True
+
+        if best_i < 0 or best_delta >= -eps:
+            break
+
+        # Rebuild the tour with the chain moved in after position best_k
+        pos = 0
+        for m in range(n):
+            if best_i <= m <= best_e:
+                continue
+            out[pos] = r[m]
+            pos += 1
+            if m == best_k:
+                for t in range(best_e - best_i + 1):
+                    out[pos] = r[best_e - t] if best_rev else r[best_i + t]
+                    pos += 1
+        r, out = out, r
+
+    return r
+
+
+def _nn_tsp_numpy(order: np.ndarray, home: int, countries: np.ndarray) -> np.ndarray:
+    """NumPy version of _nn_tsp_loop: one vectorized row scan per step."""
+    pending = np.zeros(order.shape[0], dtype=bool)
+    pending[countries] = True
+    pending[home] = False
+    n = int(pending.sum())
+    route = np.empty(n + 2, dtype=np.int64)
+    route[0] = route[n + 1] = home
+    current = home
+
+    for step in range(n):
+        row = order[current]
+        current = route[step + 1] = row[np.argmax(pending[row])]  # first pending
+        pending[current] = False
+
+    return route
+
+
+@lru_cache(maxsize=None)
+def _two_opt_pairs(n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Every (i, j) segment 2-opt may reverse in a route of n nodes."""
+    seg_i, seg_j = np.triu_indices(n - 2, k=1)
+    return seg_i + 1, seg_j + 1
+
+
+def _two_opt_numpy(D: np.ndarray, route: np.ndarray, max_iter: int, eps: float) -> np.ndarray:
+    """NumPy version of _two_opt_loop: every reversal scored in one pass."""
+    r = route.copy()
+    if len(r) < 4:
+        return r
+    seg_i, seg_j = _two_opt_pairs(len(r))
+
+    for _ in range(max_iter):
+        a, b, c, d = r[seg_i - 1], r[seg_i], r[seg_j], r[seg_j + 1]
+        delta = D[a, c] + D[b, d] - D[a, b] - D[c, d]
+
+        best = int(np.argmin(delta))
+        if delta[best] >= -eps:
+            break
+        i, j = seg_i[best], seg_j[best]
+        r[i:j + 1] = r[i:j + 1][::-1]
+
+    return r
+
+
+if NUMBA_AVAILABLE:
+    # nogil: the kernels touch only their array arguments, so they release
+    # the GIL and independent solves can run in parallel threads
+    nn_tsp = njit(cache=True, nogil=True)(_nn_tsp_loop)
+    two_opt = njit(cache=True, nogil=True)(_two_opt_loop)
+    or_opt = njit(cache=True, nogil=True)(_or_opt_loop)
+else:
+    nn_tsp = _nn_tsp_numpy
+    two_opt = _two_opt_numpy
+    # Only run once per solve, after 2-opt has converged, so a few hundred
+    # interpreted move evaluations per pass are affordable
+    or_opt = _or_opt_loop
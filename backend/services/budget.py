@@ -10,14 +10,23 @@ Improvement over original:
 """
 
 from typing import List, Dict, Set, Tuple
+
+import numpy as np
+
 from backend.config import MIN_DAYS_PER_COUNTRY
+from backend.data import CountryDB
 
 
 class BudgetService:
     """Handles all budget-related calculations."""
 
-    def __init__(self, countries_data: Dict):
+    def __init__(self, countries_data: CountryDB):
         self.countries_data = countries_data
+        # Minimum visit cost per country, aligned with countries_data.names
+        self._min_cost = (
+            countries_data.travel_cost.astype(np.float64)
+            + countries_data.accom_cost.astype(np.float64) * MIN_DAYS_PER_COUNTRY
+        )
 
     def calculate_country_cost(self, country: str, days: int) -> Dict[str, float]:
         """Calculate full cost for visiting a country."""
@@ -38,33 +47,35 @@ class BudgetService:
         """
         Calculate total itinerary cost including return flight.
 
-        Includes:
-        - Travel cost to each country
-        - Accommodation for allocated days
-        - Return flight from last country back home
+        Cost model: each visited stop costs its avg_travel_cost (the flight in)
+        plus avg_accommodation_cost per day, and the trip ends with one flight
+        into the home country, priced at the home country's avg_travel_cost.
+        Every leg is priced by its destination, so the total does not depend
+        on which direction the tour is flown.
         """
-        total = 0.0
+        assert route[0] == route[-1], "route must start and end at home"
+        db = self.countries_data
+        visited = route[1:-1]
+        idx = np.fromiter((db.name_to_idx[c] for c in visited), dtype=np.intp, count=len(visited))
+        days = np.fromiter(
+            (days_distribution.get(c, MIN_DAYS_PER_COUNTRY) for c in visited),
+            dtype=np.int64, count=len(visited)
+        )
 
-        # Cost for each visited country
-        for country in route[1:-1]:
-            days = days_distribution.get(country, MIN_DAYS_PER_COUNTRY)
-            costs = self.calculate_country_cost(country, days)
-            total += costs["total"]
+        # Travel to and accommodation in each visited country
+        total = int(db.travel_cost[idx].sum(dtype=np.int64)) + int(np.dot(db.accom_cost[idx], days))
 
-        # Return flight from last visited country
-        if len(route) >= 2:
-            last_visited = route[-2]
-            total += self.countries_data[last_visited]["avg_travel_cost"]
+        # Return flight into the home country
+        total += int(db.travel_cost[db.name_to_idx[route[0]]])
 
-        return total
+        return float(total)
 
     def enforce_budget(
         self,
         countries: List[str],
         home_country: str,
         budget: float,
-        interests: Set[str],
-        optimizer  # TourOptimizer instance
+        interests: Set[str]
     ) -> Tuple[List[str], List[str], Dict[str, int]]:
         """
         Enforce budget by iteratively removing the worst-value country.
@@ -74,29 +85,43 @@ class BudgetService:
         relevant one. This version removes the country with the worst
         cost-to-interest ratio, preserving the best value destinations.
 
+        Every surviving stop is costed at MIN_DAYS_PER_COUNTRY days, and no
+        leg's price depends on the route, so no tour is solved here.
+
         Args:
             countries: Selected countries
             home_country: Starting country
             budget: Total budget
             interests: User interests
-            optimizer: TourOptimizer instance for routing
 
         Returns:
             (final_countries, warnings, days_distribution)
         """
         warnings = []
-        working = countries[:]  # Don't mutate input
+        interests = frozenset(interests)
+        db = self.countries_data
+
+        # Countries are never copied or removed from the input list; an alive
+        # mask tracks the survivors. Value ratios don't change as countries
+        # drop out, so they are computed once.
+        ratios = self._value_ratios(countries, interests)
+        alive = np.ones(len(countries), dtype=bool)
+        n_alive = len(countries)
+
+        # The trip costs the survivors' minimum visit costs plus the flight
+        # home, so dropping a country just subtracts its minimum visit cost
+        idx = np.fromiter((db.name_to_idx[c] for c in countries), dtype=np.intp, count=len(countries))
+        return_cost = float(db.travel_cost[db.name_to_idx[home_country]])
+        floor_cost = float(self._min_cost[idx].sum())
 
-        while working:
-            route = optimizer.solve_tsp(working, home_country)
-            total_days = max(len(working) * MIN_DAYS_PER_COUNTRY, 1)
-            days_dist = optimizer.distribute_days(total_days, route, interests)
-            total_cost = self.calculate_total_cost(route, days_dist)
+        while n_alive:
+            total_cost = floor_cost + return_cost
 
             if total_cost <= budget:
-                return working, warnings, days_dist
+                working = [c for c, keep in zip(countries, alive) if keep]
+                return working, warnings, dict.fromkeys(working, MIN_DAYS_PER_COUNTRY)
 
-            if len(working) <= 1:
+            if n_alive <= 1:
                 warnings.append(
                     f"Budget ${budget:,.0f} is insufficient even for 1 country. "
                     f"Minimum needed: ${total_cost:,.0f}"
@@ -104,33 +129,28 @@ class BudgetService:
                 return [], warnings, {}
 
             # Find the worst value country (highest cost per interest match)
-            worst = self._find_worst_value(working, interests)
-            removed_cost = self.calculate_country_cost(worst, MIN_DAYS_PER_COUNTRY)["total"]
+            worst_i = int(np.argmax(np.where(alive, ratios, -np.inf)))
+            worst = countries[worst_i]
+            removed_cost = float(self._min_cost[idx[worst_i]])
             warnings.append(
                 f"Removed {worst} (cost: ${removed_cost:,.0f}) to stay within budget"
             )
-            working.remove(worst)
+            alive[worst_i] = False
+            n_alive -= 1
+            floor_cost -= removed_cost
 
-        return working, warnings, {}
+        return [], warnings, {}
 
-    def _find_worst_value(self, countries: List[str], interests: Set[str]) -> str:
-        """Find the country with the worst cost-to-interest ratio."""
-        worst_country = countries[0]
-        worst_ratio = 0.0
+    def _value_ratios(self, countries: List[str], interests: Set[str]) -> np.ndarray:
+        """Minimum cost per matched interest for each country (inf if none match)."""
+        db = self.countries_data
+        idx = np.fromiter((db.name_to_idx[c] for c in countries), dtype=np.intp, count=len(countries))
+        min_cost = self._min_cost[idx]
+        interest_match = np.bitwise_count(db.interest_masks[idx] & np.uint64(db.interest_mask(interests)))
 
-        for country in countries:
-            data = self.countries_data[country]
-            min_cost = data["avg_travel_cost"] + data["avg_accommodation_cost"] * MIN_DAYS_PER_COUNTRY
-            interest_match = len(set(data["interests"]) & interests)
-
-            # Higher ratio = worse value (more expensive per interest)
-            ratio = min_cost / interest_match if interest_match > 0 else float("inf")
-
-            if ratio > worst_ratio:
-                worst_ratio = ratio
-                worst_country = country
-
-        return worst_country
+        # Higher ratio = worse value (more expensive per interest)
+        with np.errstate(divide="ignore"):
+            return np.where(interest_match > 0, min_cost / np.maximum(interest_match, 1), np.inf)
 
     def generate_summary(
         self,
@@ -174,14 +194,14 @@ class BudgetService:
         home_country: str
     ) -> float:
         """Calculate the absolute minimum cost for a set of countries."""
-        total = 0.0
-        for country in countries:
-            data = self.countries_data[country]
-            total += data["avg_travel_cost"]
-            total += data["avg_accommodation_cost"] * MIN_DAYS_PER_COUNTRY
-
-        # Return flight
-        if countries:
-            total += self.countries_data[countries[-1]]["avg_travel_cost"]
+        if not countries:
+            return 0.0
+
+        db = self.countries_data
+        idx = np.fromiter((db.name_to_idx[c] for c in countries), dtype=np.intp, count=len(countries))
+        total = float(self._min_cost[idx].sum())
+
+        # Return flight into the home country (see calculate_total_cost)
+        total += float(db.travel_cost[db.name_to_idx[home_country]])
 
         return total
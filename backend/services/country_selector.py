@@ -10,23 +10,34 @@ Improvement over original:
 """
 
 from typing import List, Dict, Set, Tuple
+
+import numpy as np
+
 from backend.config import BUDGET_SAFETY_MARGIN, MIN_DAYS_PER_COUNTRY
+from backend.data import CountryDB
 
 
 class CountrySelector:
     """Selects the best countries to visit within a budget."""
 
-    def __init__(self, countries_data: Dict):
+    def __init__(self, countries_data: CountryDB):
         self.countries_data = countries_data
+        # Per-country arrays aligned with countries_data.names, built once
+        self._min_cost = (
+            countries_data.travel_cost.astype(np.float64)
+            + countries_data.accom_cost.astype(np.float64) * MIN_DAYS_PER_COUNTRY
+        )
+        self._interest_sets = [
+            frozenset(countries_data[name]["interests"]) for name in countries_data.names
+        ]
 
     def minimum_cost(self, country: str) -> float:
         """Minimum cost to visit a country (travel + min days accommodation)."""
-        data = self.countries_data[country]
-        return data["avg_travel_cost"] + (data["avg_accommodation_cost"] * MIN_DAYS_PER_COUNTRY)
+        return float(self._min_cost[self.countries_data.name_to_idx[country]])
 
     def interest_score(self, country: str, interests: Set[str]) -> int:
         """How many user interests a country matches."""
-        return len(set(self.countries_data[country]["interests"]) & interests)
+        return len(self._interest_sets[self.countries_data.name_to_idx[country]] & interests)
 
     def select_countries(
         self,
@@ -54,29 +65,33 @@ class CountrySelector:
         Returns:
             List of selected country names
         """
+        db = self.countries_data
+
+        # Vectorized scoring: popcount of shared interest bits, one pass over all countries
+        user_mask = np.uint64(db.interest_mask(interests))
+        scores = np.bitwise_count(db.interest_masks & user_mask)
+        min_costs = self._min_cost
+
         # Build candidate list (exclude home country, must have at least 1 interest match)
-        candidates = []
-        for country, data in self.countries_data.items():
-            if country == home_country:
-                continue
-            score = self.interest_score(country, interests)
-            if score > 0:
-                candidates.append({
-                    "country": country,
-                    "score": score,
-                    "min_cost": self.minimum_cost(country),
-                })
+        eligible = scores > 0
+        eligible[db.name_to_idx[home_country]] = False
+
+        candidates = [
+            {
+                "country": db.names[i],
+                "score": int(scores[i]),
+                "min_cost": float(min_costs[i]),
+            }
+            for i in np.flatnonzero(eligible)
+        ]
 
         if not candidates:
             return []
 
-        # Apply safety margin and reserve return flight cost
+        # Apply safety margin and reserve the flight home, priced at the home
+        # country's travel cost as in BudgetService.calculate_total_cost
         working_budget = budget * BUDGET_SAFETY_MARGIN
-        max_return_cost = max(
-            self.countries_data[c]["avg_travel_cost"]
-            for c in self.countries_data
-        )
-        working_budget -= max_return_cost
+        working_budget -= float(db.travel_cost[db.name_to_idx[home_country]])
 
         if working_budget <= 0:
             return []
@@ -99,7 +114,7 @@ class CountrySelector:
         0/1 Knapsack selection for optimal budget utilization.
 
         Uses integer budget granularity of $10 to keep DP table manageable.
-        Time complexity: O(n * W/granularity * max_items)
+        Time complexity: O(n) vector operations of length W/granularity
         """
         granularity = 10  # $10 steps
         W = int(budget / granularity)
@@ -108,40 +123,36 @@ class CountrySelector:
         if W <= 0:
             return []
 
-        # DP table: dp[i][w] = (max_score, count_used) considering first i items with budget w
-        # We track both score and count to enforce max_items
-        INF = -1
-        dp = [[(0, 0) for _ in range(W + 1)] for _ in range(n + 1)]
-        chosen = [[False] * (W + 1) for _ in range(n + 1)]
-
-        for i in range(1, n + 1):
-            cost_units = int(candidates[i - 1]["min_cost"] / granularity)
-            score = candidates[i - 1]["score"]
-
-            for w in range(W + 1):
-                # Don't take item i
-                dp[i][w] = dp[i - 1][w]
-                chosen[i][w] = False
-
-                # Take item i (if budget allows and under max_items)
-                if cost_units <= w:
-                    prev_score, prev_count = dp[i - 1][w - cost_units]
-                    if prev_count < max_items:
-                        new_score = prev_score + score
-                        new_count = prev_count + 1
-                        curr_score, _ = dp[i][w]
-                        if new_score > curr_score:
-                            dp[i][w] = (new_score, new_count)
-                            chosen[i][w] = True
+        cost_units = [int(c["min_cost"] / granularity) for c in candidates]
+
+        # Rolling 1D tables over budget w: best score and the item count behind it.
+        # Each item reads the previous row through a fresh slice, so no
+        # right-to-left sweep is needed; chosen[i] records where item i was taken.
+        dp = np.zeros(W + 1, dtype=np.int32)
+        count = np.zeros(W + 1, dtype=np.int8)
+        chosen = np.zeros((n, W + 1), dtype=bool)
+
+        for i in range(n):
+            cu = cost_units[i]
+            if cu > W:
+                continue
+            score = candidates[i]["score"]
+
+            cand_score = dp[:W + 1 - cu] + score
+            cand_count = count[:W + 1 - cu] + 1
+            mask = (cand_count <= max_items) & (cand_score > dp[cu:])
+
+            np.putmask(dp[cu:], mask, cand_score)
+            np.putmask(count[cu:], mask, cand_count)
+            chosen[i, cu:] = mask
 
         # Backtrack to find selected countries
         selected = []
         w = W
-        for i in range(n, 0, -1):
-            if chosen[i][w]:
-                selected.append(candidates[i - 1]["country"])
-                cost_units = int(candidates[i - 1]["min_cost"] / granularity)
-                w -= cost_units
+        for i in range(n - 1, -1, -1):
+            if chosen[i, w]:
+                selected.append(candidates[i]["country"])
+                w -= cost_units[i]
 
         return selected
 
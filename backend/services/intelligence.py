@@ -4,9 +4,18 @@ Intelligence Service — Season Awareness, Currency Conversion, Smart Recommenda
 Phase 3 module providing rich contextual intelligence for each trip stop.
 """
 
+import heapq
 import math
+import re
+import sys
+from collections import namedtuple
+from dataclasses import dataclass
 from datetime import date
-from typing import Dict, List, Optional, Tuple, Set
+from functools import lru_cache
+from itertools import islice
+from operator import itemgetter
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple, Set
 
 
 # ─── Month Name Mapping ──────────────────────────────────────────
@@ -17,6 +26,66 @@ MONTH_NAMES = {
     "september": 9, "october": 10, "november": 11, "december": 12,
 }
 
+# Month sets as 12-bit masks: bit m-1 set for month m
+_ALL_MONTHS_MASK = (1 << 12) - 1
+
+# One best-season piece: "May" or "November - March" (month names are letters only)
+_SEASON_RANGE_RE = re.compile(r"\s*([A-Za-z]+)\s*(?:-\s*([A-Za-z]+)\s*)?")
+
+
+def _month_run_mask(start_month: int, span: int) -> int:
+    """Mask of `span` consecutive months from start_month, wrapping past December."""
+    if span >= 12:
+        return _ALL_MONTHS_MASK
+    run = ((1 << span) - 1) << (start_month - 1)
+    return (run | (run >> 12)) & _ALL_MONTHS_MASK
+
+
+def _mask_to_months(mask: int) -> List[int]:
+    return [m for m in range(1, 13) if mask >> (m - 1) & 1]
+
+
+def _parse_season_mask(season_str: str) -> int:
+    """Month mask for a best-season string; all months if it names none."""
+    mask = 0
+    # Each comma-separated piece is one month or a "Start - End" range
+    for rng in season_str.split(","):
+        match = _SEASON_RANGE_RE.fullmatch(rng)
+        if not match:
+            continue
+        start_month = MONTH_NAMES.get(match[1].lower())
+        if match[2] is None:
+            if start_month:
+                mask |= 1 << (start_month - 1)
+            continue
+        end_month = MONTH_NAMES.get(match[2].lower())
+        if start_month and end_month:
+            # Wraps around for ranges like November - March
+            mask |= _month_run_mask(start_month, (end_month - start_month) % 12 + 1)
+
+    return mask or _ALL_MONTHS_MASK
+
+
+# (rating, warning template, tip template), indexed by how many of the
+# 40% / 80% overlap thresholds a visit clears
+_SEASON_OUTCOMES = (
+    (
+        "off-season",
+        "{country}: You're visiting during off-season. Best time is {best_season}",
+        "Expect possible weather challenges. Benefits: fewer crowds and lower prices.",
+    ),
+    (
+        "partial",
+        "{country}: Your dates partially overlap with the best season ({best_season})",
+        "Consider adjusting dates for optimal weather in {country}.",
+    ),
+    (
+        "ideal",
+        None,
+        "Great timing! {country} is at its best during your visit.",
+    ),
+)
+
 
 # ─── USD Exchange Rates (embedded snapshot — no external API needed) ──
 
@@ -50,12 +119,291 @@ EXCHANGE_RATES = {
     "TMT": 3.50,
 }
 
+# Budget in local currency for display, e.g. "12,345 JPY"
+_format_local = "{:,.0f} {}".format
+
+
+# ─── Activity Suggestions (per interest) ─────────────────────────
+
+Activity = namedtuple("Activity", "name duration priority")
+
+ACTIVITY_MAP = {
+    "culture": (
+        Activity("Visit local museums & galleries", "Half day", "high"),
+        Activity("Attend a traditional performance", "Evening", "medium"),
+        Activity("Join a cultural walking tour", "3-4 hours", "high"),
+    ),
+    "food": (
+        Activity("Take a cooking class", "Half day", "high"),
+        Activity("Street food tour", "3-4 hours", "high"),
+        Activity("Fine dining experience", "Evening", "medium"),
+    ),
+    "beaches": (
+        Activity("Beach hopping day", "Full day", "high"),
+        Activity("Sunset beach walk", "2 hours", "medium"),
+        Activity("Water sports / snorkeling", "Half day", "high"),
+    ),
+    "nature": (
+        Activity("Guided nature hike", "Full day", "high"),
+        Activity("National park visit", "Full day", "high"),
+        Activity("Sunrise/sunset viewpoint", "2 hours", "medium"),
+    ),
+    "adventure": (
+        Activity("Adventure sports experience", "Half day", "high"),
+        Activity("Zip-lining or paragliding", "3-4 hours", "medium"),
+        Activity("Multi-day trekking", "2-3 days", "low"),
+    ),
+    "temples": (
+        Activity("Temple complex tour", "Half day", "high"),
+        Activity("Sunrise temple visit", "3 hours", "high"),
+        Activity("Meditation / spiritual retreat", "Half day", "low"),
+    ),
+    "historical": (
+        Activity("Historical landmark tour", "Full day", "high"),
+        Activity("Archaeological site visit", "Half day", "high"),
+        Activity("History museum deep-dive", "3-4 hours", "medium"),
+    ),
+    "nightlife": (
+        Activity("Nightlife district exploration", "Evening", "high"),
+        Activity("Rooftop bar hopping", "Evening", "medium"),
+        Activity("Live music venue", "Evening", "medium"),
+    ),
+    "shopping": (
+        Activity("Local market exploration", "Half day", "high"),
+        Activity("Artisan & craft shopping", "3-4 hours", "medium"),
+        Activity("Shopping district tour", "Half day", "medium"),
+    ),
+    "luxury": (
+        Activity("Spa & wellness experience", "Half day", "high"),
+        Activity("Fine dining at top restaurant", "Evening", "high"),
+        Activity("Private guided tour", "Full day", "medium"),
+    ),
+    "wildlife": (
+        Activity("Wildlife safari / tour", "Full day", "high"),
+        Activity("Wildlife sanctuary visit", "Half day", "high"),
+        Activity("Bird watching excursion", "3-4 hours", "low"),
+    ),
+    "diving": (
+        Activity("Scuba diving excursion", "Full day", "high"),
+        Activity("Snorkeling trip", "Half day", "high"),
+        Activity("Glass-bottom boat tour", "3 hours", "low"),
+    ),
+    "technology": (
+        Activity("Tech district / hub visit", "Half day", "high"),
+        Activity("Innovation museum or expo", "3-4 hours", "medium"),
+        Activity("Smart city tour", "Half day", "low"),
+    ),
+    "art": (
+        Activity("Art gallery tour", "Half day", "high"),
+        Activity("Street art walking tour", "3 hours", "high"),
+        Activity("Art workshop / class", "3-4 hours", "medium"),
+    ),
+    "architecture": (
+        Activity("Architecture walking tour", "Half day", "high"),
+        Activity("Iconic building visits", "3-4 hours", "high"),
+        Activity("Modern vs. historic contrast tour", "Full day", "medium"),
+    ),
+    "islands": (
+        Activity("Island hopping day trip", "Full day", "high"),
+        Activity("Beach & lagoon exploration", "Full day", "high"),
+        Activity("Boat tour / sailing", "Half day", "medium"),
+    ),
+    "photography": (
+        Activity("Golden hour photo walk", "3 hours", "high"),
+        Activity("Scenic viewpoint tour", "Half day", "high"),
+        Activity("Night photography session", "Evening", "medium"),
+    ),
+    "music": (
+        Activity("Live local music performance", "Evening", "high"),
+        Activity("Music festival or event", "Full day", "high"),
+        Activity("Traditional instrument workshop", "3 hours", "medium"),
+    ),
+    "wellness": (
+        Activity("Spa & massage experience", "Half day", "high"),
+        Activity("Yoga or meditation class", "2 hours", "high"),
+        Activity("Hot springs visit", "Half day", "medium"),
+    ),
+    "hiking": (
+        Activity("Day hike to scenic trail", "Full day", "high"),
+        Activity("Guided mountain trek", "Full day", "high"),
+        Activity("Multi-day trekking route", "2-3 days", "low"),
+    ),
+    "festivals": (
+        Activity("Attend local festival or celebration", "Full day", "high"),
+        Activity("Cultural carnival experience", "Evening", "high"),
+        Activity("Night market festival", "Evening", "medium"),
+    ),
+    "sports": (
+        Activity("Watch a local sports event", "3-4 hours", "high"),
+        Activity("Adventure sports activity", "Half day", "high"),
+        Activity("Golf or tennis session", "3 hours", "medium"),
+    ),
+    "surfing": (
+        Activity("Surfing lesson or session", "Half day", "high"),
+        Activity("Beach & surf culture tour", "Full day", "medium"),
+        Activity("Stand-up paddleboarding", "2 hours", "medium"),
+    ),
+    "skiing": (
+        Activity("Ski resort day pass", "Full day", "high"),
+        Activity("Snowboarding session", "Half day", "high"),
+        Activity("Après-ski experience", "Evening", "medium"),
+    ),
+    "romance": (
+        Activity("Sunset dinner cruise", "Evening", "high"),
+        Activity("Couples spa experience", "Half day", "high"),
+        Activity("Scenic picnic outing", "3 hours", "medium"),
+    ),
+    "family": (
+        Activity("Family-friendly amusement park", "Full day", "high"),
+        Activity("Interactive museum visit", "Half day", "high"),
+        Activity("Wildlife park or zoo", "Half day", "medium"),
+    ),
+    "desert": (
+        Activity("Desert safari excursion", "Full day", "high"),
+        Activity("Camel ride & dune experience", "Half day", "high"),
+        Activity("Desert stargazing night", "Evening", "medium"),
+    ),
+    "mountains": (
+        Activity("Mountain viewpoint visit", "Half day", "high"),
+        Activity("Cable car or gondola ride", "3 hours", "high"),
+        Activity("Alpine lake hike", "Full day", "medium"),
+    ),
+    "safari": (
+        Activity("Game drive safari", "Full day", "high"),
+        Activity("Bush walk guided tour", "Half day", "high"),
+        Activity("Night safari experience", "Evening", "medium"),
+    ),
+    "spiritual": (
+        Activity("Visit sacred sites & shrines", "Half day", "high"),
+        Activity("Meditation retreat session", "Half day", "high"),
+        Activity("Pilgrimage trail walk", "Full day", "medium"),
+    ),
+    "cruise": (
+        Activity("River or harbor cruise", "Half day", "high"),
+        Activity("Sunset boat tour", "3 hours", "high"),
+        Activity("Catamaran day trip", "Full day", "medium"),
+    ),
+    "camping": (
+        Activity("Overnight camping experience", "Full day", "high"),
+        Activity("Glamping resort stay", "Full day", "medium"),
+        Activity("Campfire & stargazing night", "Evening", "medium"),
+    ),
+    "cycling": (
+        Activity("City cycling tour", "Half day", "high"),
+        Activity("Countryside bike ride", "Full day", "high"),
+        Activity("Mountain biking trail", "Half day", "medium"),
+    ),
+}
+
+_PRIORITY_ORDER = {"high": 0, "medium": 1, "low": 2}
+
+
+def _priority_rank(act: Activity) -> int:
+    return _PRIORITY_ORDER.get(act.priority, 1)
+
+
+# Each interest's activities are stored high priority first (stable, so
+# ties keep their listed order); suggestions then merge instead of sorting
+ACTIVITY_MAP = {
+    interest: tuple(sorted(acts, key=_priority_rank)) for interest, acts in ACTIVITY_MAP.items()
+}
+
+# Ready-made suggestion records, (priority rank, fields incl. interest).
+# The fields are read-only views, so requests hand them out as-is
+_SUGGESTIONS = {
+    interest: tuple(
+        (_priority_rank(act), MappingProxyType({**act._asdict(), "interest": interest}))
+        for act in acts
+    )
+    for interest, acts in ACTIVITY_MAP.items()
+}
+
+# Same suggestions without multi-day activities, for stays too short to fit them
+_SHORT_SUGGESTIONS = {
+    interest: tuple(s for s in suggestions if "days" not in s[1]["duration"].lower())
+    for interest, suggestions in _SUGGESTIONS.items()
+}
+
+
+# ─── Packing Tips (by climate) ───────────────────────────────────
+
+_CLIMATE_PACKING = {
+    "tropical": ("Light, breathable clothing", "Strong sunscreen (SPF 50+)", "Insect repellent"),
+    "winter": ("Warm layers & jacket", "Thermal undergarments", "Waterproof boots"),
+    "summer": ("Light summer clothing", "Sunscreen & sunglasses", "Hat for sun protection"),
+    "shoulder": ("Layered clothing for variable weather", "Light rain jacket"),
+}
+
+# Outside the tropics: climate for months 1-12, indexed by hemisphere
+# (False = southern, True = northern; the seasons swap across the equator)
+_CLIMATE_BY_MONTH = (
+    ("summer", "summer", "shoulder", "shoulder", "shoulder", "winter",
+     "winter", "winter", "shoulder", "shoulder", "shoulder", "summer"),
+    ("winter", "winter", "shoulder", "shoulder", "shoulder", "summer",
+     "summer", "summer", "shoulder", "shoulder", "shoulder", "winter"),
+)
+
+
+# ─── Per-Country Profile ─────────────────────────────────────────
+
+@dataclass(frozen=True, slots=True)
+class _CountryProfile:
+    """The fields the intelligence layers read, extracted once per country."""
+    interests: FrozenSet[str]
+    interest_mask: int  # interests as bits of the service's interest vocabulary
+    currency: str
+    rate: float
+    accom: float
+    top_cities: List[str]
+    lat: float
+    best_season: str
+    season_mask: int  # best months, bit m-1 set for month m
+
+
+def _build_profile(data: Dict, interest_bits: Dict[str, int]) -> _CountryProfile:
+    # Interned so that set/dict lookups against the module's literal tables
+    # (and interned request interests) match on identity before comparing text
+    currency = data.get("currency", "USD")
+    if isinstance(currency, str):
+        currency = sys.intern(currency)
+    return _CountryProfile(
+        interests=frozenset(map(sys.intern, data.get("interests", []))),
+        interest_mask=sum(interest_bits[i] for i in set(data.get("interests", []))),
+        currency=currency,
+        rate=EXCHANGE_RATES.get(currency, 1.0),
+        accom=data.get("avg_accommodation_cost", 100),
+        top_cities=data.get("top_cities", []),
+        lat=data.get("coordinates", [0])[0],
+        best_season=data.get("best_season", ""),
+        season_mask=_parse_season_mask(data.get("best_season", "")),
+    )
+
+
+# What an unknown country looks like (the old ``.get(country, {})`` default)
+_EMPTY_PROFILE = _build_profile({}, {})
+
 
 class IntelligenceService:
     """Provides season awareness, currency conversion, and smart recommendations."""
 
     def __init__(self, countries_data: Dict):
         self.countries_data = countries_data
+        # Season checks only depend on the calendar months spanned, so they
+        # are memoized on (country, first-of-start-month, first-of-end-month)
+        self._season_cache = lru_cache(maxsize=4096)(self._check_season)
+        # Every interest any country offers, sorted, so that walking a mask's
+        # bits from low to high yields interest names in sorted order
+        self._interest_names: Tuple[str, ...] = tuple(sorted(
+            {sys.intern(i) for data in countries_data.values() for i in data.get("interests", [])}
+        ))
+        self._interest_bits: Dict[str, int] = {
+            name: 1 << i for i, name in enumerate(self._interest_names)
+        }
+        # Per-country fields, best-season string parsed up front
+        self._profiles: Dict[str, _CountryProfile] = {
+            country: _build_profile(data, self._interest_bits)
+            for country, data in countries_data.items()
+        }
 
     # ─── Season Awareness ─────────────────────────────────────────
 
@@ -64,31 +412,7 @@ class IntelligenceService:
         Parse a season string like 'March - May, September - November'
         into a list of month numbers [3, 4, 5, 9, 10, 11].
         """
-        if not season_str:
-            return list(range(1, 13))  # All months if no data
-
-        months = []
-        # Split by comma for multiple ranges
-        ranges = [r.strip() for r in season_str.split(",")]
-
-        for rng in ranges:
-            parts = [p.strip().lower() for p in rng.split("-")]
-            if len(parts) == 2:
-                start_month = MONTH_NAMES.get(parts[0])
-                end_month = MONTH_NAMES.get(parts[1])
-                if start_month and end_month:
-                    if start_month <= end_month:
-                        months.extend(range(start_month, end_month + 1))
-                    else:
-                        # Wrap around (e.g., November - March)
-                        months.extend(range(start_month, 13))
-                        months.extend(range(1, end_month + 1))
-            elif len(parts) == 1:
-                m = MONTH_NAMES.get(parts[0])
-                if m:
-                    months.append(m)
-
-        return sorted(set(months)) if months else list(range(1, 13))
+        return _mask_to_months(_parse_season_mask(season_str))
 
     def check_season(
         self, country: str, start_date: date, end_date: date
@@ -96,6 +420,20 @@ class IntelligenceService:
         """
         Check if a country visit falls within its best travel season.
 
+        Memoized per calendar-month span; see _check_season for the result shape.
+        """
+        if start_date > end_date:
+            result = self._check_season(country, start_date, end_date)
+        else:
+            result = self._season_cache(country, start_date.replace(day=1), end_date.replace(day=1))
+        return {**result, "travel_months": list(result["travel_months"])}
+
+    def _check_season(
+        self, country: str, start_date: date, end_date: date
+    ) -> Dict:
+        """
+        Check if a country visit falls within its best travel season.
+
         Returns:
             {
                 "is_best_season": bool,
@@ -106,8 +444,8 @@ class IntelligenceService:
                 "tip": Optional[str],
             }
         """
-        data = self.countries_data.get(country, {})
-        best_season = data.get("best_season", "")
+        profile = self._profiles.get(country, _EMPTY_PROFILE)
+        best_season = profile.best_season
 
         if not best_season:
             return {
@@ -119,46 +457,28 @@ class IntelligenceService:
                 "tip": None,
             }
 
-        best_months = self.parse_season_months(best_season)
-        travel_months = set()
-
-        current = start_date
-        while current <= end_date:
-            travel_months.add(current.month)
-            current = current.replace(day=28) if current.month == 2 else current
-            # Advance safely
-            if current.month == 12:
-                try:
-                    current = current.replace(year=current.year + 1, month=1, day=1)
-                except ValueError:
-                    break
-            else:
-                try:
-                    current = current.replace(month=current.month + 1, day=1)
-                except ValueError:
-                    break
-
-        overlap = travel_months.intersection(set(best_months))
-        overlap_ratio = len(overlap) / len(travel_months) if travel_months else 1.0
-
-        if overlap_ratio >= 0.8:
-            rating = "ideal"
-            warning = None
-            tip = f"Great timing! {country} is at its best during your visit."
-        elif overlap_ratio >= 0.4:
-            rating = "partial"
-            warning = f"{country}: Your dates partially overlap with the best season ({best_season})"
-            tip = f"Consider adjusting dates for optimal weather in {country}."
-        else:
-            rating = "off-season"
-            warning = f"{country}: You're visiting during off-season. Best time is {best_season}"
-            tip = f"Expect possible weather challenges. Benefits: fewer crowds and lower prices."
+        best_mask = profile.season_mask
+        # Months covered by the range, by year/month arithmetic alone
+        months_span = (
+            (end_date.year - start_date.year) * 12 + (end_date.month - start_date.month) + 1
+            if start_date <= end_date else 0
+        )
+        travel_mask = _month_run_mask(start_date.month, months_span) if months_span else 0
+
+        travel_count = travel_mask.bit_count()
+        overlap_ratio = (travel_mask & best_mask).bit_count() / travel_count if travel_count else 1.0
+
+        # 0 = off-season, 1 = partial (>= 40% overlap), 2 = ideal (>= 80%)
+        rating, warning, tip = _SEASON_OUTCOMES[(overlap_ratio >= 0.4) + (overlap_ratio >= 0.8)]
+        if warning is not None:
+            warning = warning.format(country=country, best_season=best_season)
+        tip = tip.format(country=country)
 
         return {
             "is_best_season": rating == "ideal",
             "season_rating": rating,
             "best_months": best_season,
-            "travel_months": sorted(travel_months),
+            "travel_months": _mask_to_months(travel_mask),
             "warning": warning,
             "tip": tip,
         }
@@ -178,15 +498,16 @@ class IntelligenceService:
                 "symbol": str,
             }
         """
-        data = self.countries_data.get(country, {})
-        currency = data.get("currency", "USD")
-        rate = EXCHANGE_RATES.get(currency, 1.0)
+        profile = self._profiles.get(country, _EMPTY_PROFILE)
+        currency = profile.currency
+        rate = profile.rate
+        budget_local = budget_usd * rate
 
         return {
             "currency_code": currency,
             "exchange_rate": round(rate, 2),
-            "budget_local": round(budget_usd * rate, 0),
-            "formatted": f"{budget_usd * rate:,.0f} {currency}",
+            "budget_local": round(budget_local, 0),
+            "formatted": _format_local(budget_local, currency),
         }
 
     def get_spending_guide(self, country: str, days: int) -> Dict:
@@ -195,15 +516,18 @@ class IntelligenceService:
 
         Returns daily budget breakdown in local currency.
         """
-        data = self.countries_data.get(country, {})
-        currency = data.get("currency", "USD")
-        rate = EXCHANGE_RATES.get(currency, 1.0)
-        accom_per_day = data.get("avg_accommodation_cost", 100)
+        profile = self._profiles.get(country, _EMPTY_PROFILE)
+        currency = profile.currency
+        rate = profile.rate
+        accom_per_day = profile.accom
 
         # Estimated daily spending in USD
         meal_budget_usd = accom_per_day * 0.4  # rough estimate: 40% of accommodation
         transport_usd = accom_per_day * 0.2
         activities_usd = accom_per_day * 0.3
+        # Summed in the same order as the categories, so it is the exact
+        # float the per-field totals used to recompute twice
+        daily_total_local = (accom_per_day + meal_budget_usd + transport_usd + activities_usd) * rate
 
         return {
             "currency_code": currency,
@@ -211,10 +535,48 @@ class IntelligenceService:
             "daily_meals_local": round(meal_budget_usd * rate, 0),
             "daily_transport_local": round(transport_usd * rate, 0),
             "daily_activities_local": round(activities_usd * rate, 0),
-            "daily_total_local": round((accom_per_day + meal_budget_usd + transport_usd + activities_usd) * rate, 0),
-            "total_local": round((accom_per_day + meal_budget_usd + transport_usd + activities_usd) * rate * days, 0),
+            "daily_total_local": round(daily_total_local, 0),
+            "total_local": round(daily_total_local * days, 0),
         }
 
+    # ─── Batch Enrichment ─────────────────────────────────────────
+
+    def enrich_batch(
+        self,
+        countries: List[str],
+        stop_ranges: List[Tuple[date, date]],
+        stop_budgets: List[float],
+        interests: Set[str],
+        home_country: str,
+    ) -> Dict[str, Dict]:
+        """
+        Gather every intelligence layer for a whole route in one pass.
+
+        Args:
+            countries: Visited countries in route order
+            stop_ranges: (start_date, end_date) of each stay, inclusive
+            stop_budgets: USD budget of each stay, for currency conversion
+            interests: Traveler's interests
+            home_country: Traveler's origin (for visa rules)
+
+        Returns:
+            {country: {"season", "currency", "spending", "visa", "recommendations"}}
+        """
+        # Request strings are freshly decoded; intern them like the profiles' tags
+        interests = frozenset(map(sys.intern, interests))
+
+        enriched = {}
+        for country, (start, end), budget_usd in zip(countries, stop_ranges, stop_budgets):
+            days = (end - start).days + 1
+            enriched[country] = {
+                "season": self.check_season(country, start, end),
+                "currency": self.get_currency_info(country, budget_usd),
+                "spending": self.get_spending_guide(country, days),
+                "visa": get_visa_info(home_country, country),
+                "recommendations": self.generate_recommendations(country, interests, days, start),
+            }
+        return enriched
+
     # ─── Smart Recommendations ────────────────────────────────────
 
     def generate_recommendations(
@@ -224,16 +586,19 @@ class IntelligenceService:
         Generate smart recommendations for a country based on
         the traveler's interests, duration, and travel dates.
         """
-        data = self.countries_data.get(country, {})
-        country_interests = set(data.get("interests", []))
-        top_cities = data.get("top_cities", [])
-        matching_interests = interests.intersection(country_interests)
+        profile = self._profiles.get(country, _EMPTY_PROFILE)
+        # Interests outside the vocabulary match no country, so they add no bits
+        user_mask = 0
+        for interest in interests:
+            user_mask |= self._interest_bits.get(interest, 0)
+        matching_mask = user_mask & profile.interest_mask
+        matching_interests = self._mask_to_interests(matching_mask)
 
         # Activity suggestions based on interests
         activities = self._suggest_activities(country, matching_interests, days)
 
         # City recommendations
-        cities = self._suggest_cities(top_cities, days)
+        cities = self._suggest_cities(profile.top_cities, days)
 
         # Packing tips based on season
         packing = self._suggest_packing(country, start_date)
@@ -242,200 +607,40 @@ class IntelligenceService:
             "suggested_activities": activities,
             "recommended_cities": cities,
             "packing_tips": packing,
-            "matching_interests": sorted(matching_interests),
+            "matching_interests": matching_interests,
             "interest_match_pct": round(
-                len(matching_interests) / max(len(interests), 1) * 100
+                matching_mask.bit_count() / max(len(interests), 1) * 100
             ),
         }
 
-    def _suggest_activities(
-        self, country: str, matching: Set[str], days: int
-    ) -> List[Dict]:
-        """Generate activity suggestions based on interests."""
-        ACTIVITY_MAP = {
-            "culture": [
-                {"name": "Visit local museums & galleries", "duration": "Half day", "priority": "high"},
-                {"name": "Attend a traditional performance", "duration": "Evening", "priority": "medium"},
-                {"name": "Join a cultural walking tour", "duration": "3-4 hours", "priority": "high"},
-            ],
-            "food": [
-                {"name": "Take a cooking class", "duration": "Half day", "priority": "high"},
-                {"name": "Street food tour", "duration": "3-4 hours", "priority": "high"},
-                {"name": "Fine dining experience", "duration": "Evening", "priority": "medium"},
-            ],
-            "beaches": [
-                {"name": "Beach hopping day", "duration": "Full day", "priority": "high"},
-                {"name": "Sunset beach walk", "duration": "2 hours", "priority": "medium"},
-                {"name": "Water sports / snorkeling", "duration": "Half day", "priority": "high"},
-            ],
-            "nature": [
-                {"name": "Guided nature hike", "duration": "Full day", "priority": "high"},
-                {"name": "National park visit", "duration": "Full day", "priority": "high"},
-                {"name": "Sunrise/sunset viewpoint", "duration": "2 hours", "priority": "medium"},
-            ],
-            "adventure": [
-                {"name": "Adventure sports experience", "duration": "Half day", "priority": "high"},
-                {"name": "Zip-lining or paragliding", "duration": "3-4 hours", "priority": "medium"},
-                {"name": "Multi-day trekking", "duration": "2-3 days", "priority": "low"},
-            ],
-            "temples": [
-                {"name": "Temple complex tour", "duration": "Half day", "priority": "high"},
-                {"name": "Sunrise temple visit", "duration": "3 hours", "priority": "high"},
-                {"name": "Meditation / spiritual retreat", "duration": "Half day", "priority": "low"},
-            ],
-            "historical": [
-                {"name": "Historical landmark tour", "duration": "Full day", "priority": "high"},
-                {"name": "Archaeological site visit", "duration": "Half day", "priority": "high"},
-                {"name": "History museum deep-dive", "duration": "3-4 hours", "priority": "medium"},
-            ],
-            "nightlife": [
-                {"name": "Nightlife district exploration", "duration": "Evening", "priority": "high"},
-                {"name": "Rooftop bar hopping", "duration": "Evening", "priority": "medium"},
-                {"name": "Live music venue", "duration": "Evening", "priority": "medium"},
-            ],
-            "shopping": [
-                {"name": "Local market exploration", "duration": "Half day", "priority": "high"},
-                {"name": "Artisan & craft shopping", "duration": "3-4 hours", "priority": "medium"},
-                {"name": "Shopping district tour", "duration": "Half day", "priority": "medium"},
-            ],
-            "luxury": [
-                {"name": "Spa & wellness experience", "duration": "Half day", "priority": "high"},
-                {"name": "Fine dining at top restaurant", "duration": "Evening", "priority": "high"},
-                {"name": "Private guided tour", "duration": "Full day", "priority": "medium"},
-            ],
-            "wildlife": [
-                {"name": "Wildlife safari / tour", "duration": "Full day", "priority": "high"},
-                {"name": "Wildlife sanctuary visit", "duration": "Half day", "priority": "high"},
-                {"name": "Bird watching excursion", "duration": "3-4 hours", "priority": "low"},
-            ],
-            "diving": [
-                {"name": "Scuba diving excursion", "duration": "Full day", "priority": "high"},
-                {"name": "Snorkeling trip", "duration": "Half day", "priority": "high"},
-                {"name": "Glass-bottom boat tour", "duration": "3 hours", "priority": "low"},
-            ],
-            "technology": [
-                {"name": "Tech district / hub visit", "duration": "Half day", "priority": "high"},
-                {"name": "Innovation museum or expo", "duration": "3-4 hours", "priority": "medium"},
-                {"name": "Smart city tour", "duration": "Half day", "priority": "low"},
-            ],
-            "art": [
-                {"name": "Art gallery tour", "duration": "Half day", "priority": "high"},
-                {"name": "Street art walking tour", "duration": "3 hours", "priority": "high"},
-                {"name": "Art workshop / class", "duration": "3-4 hours", "priority": "medium"},
-            ],
-            "architecture": [
-                {"name": "Architecture walking tour", "duration": "Half day", "priority": "high"},
-                {"name": "Iconic building visits", "duration": "3-4 hours", "priority": "high"},
-                {"name": "Modern vs. historic contrast tour", "duration": "Full day", "priority": "medium"},
-            ],
-            "islands": [
-                {"name": "Island hopping day trip", "duration": "Full day", "priority": "high"},
-                {"name": "Beach & lagoon exploration", "duration": "Full day", "priority": "high"},
-                {"name": "Boat tour / sailing", "duration": "Half day", "priority": "medium"},
-            ],
-            "photography": [
-                {"name": "Golden hour photo walk", "duration": "3 hours", "priority": "high"},
-                {"name": "Scenic viewpoint tour", "duration": "Half day", "priority": "high"},
-                {"name": "Night photography session", "duration": "Evening", "priority": "medium"},
-            ],
-            "music": [
-                {"name": "Live local music performance", "duration": "Evening", "priority": "high"},
-                {"name": "Music festival or event", "duration": "Full day", "priority": "high"},
-                {"name": "Traditional instrument workshop", "duration": "3 hours", "priority": "medium"},
-            ],
-            "wellness": [
-                {"name": "Spa & massage experience", "duration": "Half day", "priority": "high"},
-                {"name": "Yoga or meditation class", "duration": "2 hours", "priority": "high"},
-                {"name": "Hot springs visit", "duration": "Half day", "priority": "medium"},
-            ],
-            "hiking": [
-                {"name": "Day hike to scenic trail", "duration": "Full day", "priority": "high"},
-                {"name": "Guided mountain trek", "duration": "Full day", "priority": "high"},
-                {"name": "Multi-day trekking route", "duration": "2-3 days", "priority": "low"},
-            ],
-            "festivals": [
-                {"name": "Attend local festival or celebration", "duration": "Full day", "priority": "high"},
-                {"name": "Cultural carnival experience", "duration": "Evening", "priority": "high"},
-                {"name": "Night market festival", "duration": "Evening", "priority": "medium"},
-            ],
-            "sports": [
-                {"name": "Watch a local sports event", "duration": "3-4 hours", "priority": "high"},
-                {"name": "Adventure sports activity", "duration": "Half day", "priority": "high"},
-                {"name": "Golf or tennis session", "duration": "3 hours", "priority": "medium"},
-            ],
-            "surfing": [
-                {"name": "Surfing lesson or session", "duration": "Half day", "priority": "high"},
-                {"name": "Beach & surf culture tour", "duration": "Full day", "priority": "medium"},
-                {"name": "Stand-up paddleboarding", "duration": "2 hours", "priority": "medium"},
-            ],
-            "skiing": [
-                {"name": "Ski resort day pass", "duration": "Full day", "priority": "high"},
-                {"name": "Snowboarding session", "duration": "Half day", "priority": "high"},
-                {"name": "Après-ski experience", "duration": "Evening", "priority": "medium"},
-            ],
-            "romance": [
-                {"name": "Sunset dinner cruise", "duration": "Evening", "priority": "high"},
-                {"name": "Couples spa experience", "duration": "Half day", "priority": "high"},
-                {"name": "Scenic picnic outing", "duration": "3 hours", "priority": "medium"},
-            ],
-            "family": [
-                {"name": "Family-friendly amusement park", "duration": "Full day", "priority": "high"},
-                {"name": "Interactive museum visit", "duration": "Half day", "priority": "high"},
-                {"name": "Wildlife park or zoo", "duration": "Half day", "priority": "medium"},
-            ],
-            "desert": [
-                {"name": "Desert safari excursion", "duration": "Full day", "priority": "high"},
-                {"name": "Camel ride & dune experience", "duration": "Half day", "priority": "high"},
-                {"name": "Desert stargazing night", "duration": "Evening", "priority": "medium"},
-            ],
-            "mountains": [
-                {"name": "Mountain viewpoint visit", "duration": "Half day", "priority": "high"},
-                {"name": "Cable car or gondola ride", "duration": "3 hours", "priority": "high"},
-                {"name": "Alpine lake hike", "duration": "Full day", "priority": "medium"},
-            ],
-            "safari": [
-                {"name": "Game drive safari", "duration": "Full day", "priority": "high"},
-                {"name": "Bush walk guided tour", "duration": "Half day", "priority": "high"},
-                {"name": "Night safari experience", "duration": "Evening", "priority": "medium"},
-            ],
-            "spiritual": [
-                {"name": "Visit sacred sites & shrines", "duration": "Half day", "priority": "high"},
-                {"name": "Meditation retreat session", "duration": "Half day", "priority": "high"},
-                {"name": "Pilgrimage trail walk", "duration": "Full day", "priority": "medium"},
-            ],
-            "cruise": [
-                {"name": "River or harbor cruise", "duration": "Half day", "priority": "high"},
-                {"name": "Sunset boat tour", "duration": "3 hours", "priority": "high"},
-                {"name": "Catamaran day trip", "duration": "Full day", "priority": "medium"},
-            ],
-            "camping": [
-                {"name": "Overnight camping experience", "duration": "Full day", "priority": "high"},
-                {"name": "Glamping resort stay", "duration": "Full day", "priority": "medium"},
-                {"name": "Campfire & stargazing night", "duration": "Evening", "priority": "medium"},
-            ],
-            "cycling": [
-                {"name": "City cycling tour", "duration": "Half day", "priority": "high"},
-                {"name": "Countryside bike ride", "duration": "Full day", "priority": "high"},
-                {"name": "Mountain biking trail", "duration": "Half day", "priority": "medium"},
-            ],
-        }
+    def _mask_to_interests(self, mask: int) -> List[str]:
+        """Interest names for the set bits of a mask, in sorted order."""
+        names = []
+        while mask:
+            low = mask & -mask
+            names.append(self._interest_names[low.bit_length() - 1])
+            mask ^= low
+        return names
 
-        activities = []
-        for interest in sorted(matching):
-            if interest in ACTIVITY_MAP:
-                for act in ACTIVITY_MAP[interest]:
-                    # Only suggest multi-day activities if enough time
-                    if "days" in act["duration"].lower() and days < 4:
-                        continue
-                    activities.append({**act, "interest": interest})
+    def _suggest_activities(
+        self, country: str, matching: Iterable[str], days: int
+    ) -> List[Mapping]:
+        """Generate activity suggestions (shared, read-only records) based on interests."""
+        # Only suggest multi-day activities if enough time
+        suggestions = _SUGGESTIONS if days >= 4 else _SHORT_SUGGESTIONS
 
         # Limit to reasonable number based on days
         max_activities = min(days * 2, 12)
-        # Sort by priority (high first)
-        priority_order = {"high": 0, "medium": 1, "low": 2}
-        activities.sort(key=lambda a: priority_order.get(a["priority"], 1))
 
-        return activities[:max_activities]
+        # Merge the pre-sorted per-interest lists by priority (high first).
+        # heapq.merge is stable across inputs, so equal priorities keep
+        # interest order, exactly like a stable sort of the concatenation.
+        merged = heapq.merge(
+            *(suggestions[interest] for interest in sorted(matching) if interest in suggestions),
+            key=itemgetter(0),
+        )
+
+        return [fields for _, fields in islice(merged, max_activities)]
 
     def _suggest_cities(self, top_cities: List[str], days: int) -> List[Dict]:
         """Recommend cities based on available days."""
@@ -443,34 +648,27 @@ class IntelligenceService:
             return []
 
         max_cities = min(days // 2, len(top_cities), 4)
+        if max_cities <= 0:
+            return []
+
+        days_per_city = max(1, days // max_cities)
         return [
-            {"name": city, "suggested_days": max(1, days // max(max_cities, 1))}
+            {"name": city, "suggested_days": days_per_city}
             for city in top_cities[:max_cities]
         ]
 
     def _suggest_packing(self, country: str, travel_date: date) -> List[str]:
         """Suggest packing items based on destination and season."""
-        data = self.countries_data.get(country, {})
-        interests = set(data.get("interests", []))
+        profile = self._profiles.get(country, _EMPTY_PROFILE)
+        interests = profile.interests
         month = travel_date.month
-        lat = data.get("coordinates", [0])[0]
+        lat = profile.lat
 
         tips = ["Passport & travel documents", "Travel adapter for local outlets"]
 
         # Temperature-based
-        is_northern = lat > 0
-        is_winter = (month in [12, 1, 2]) if is_northern else (month in [6, 7, 8])
-        is_summer = (month in [6, 7, 8]) if is_northern else (month in [12, 1, 2])
-        is_tropical = abs(lat) < 23.5
-
-        if is_tropical:
-            tips.extend(["Light, breathable clothing", "Strong sunscreen (SPF 50+)", "Insect repellent"])
-        elif is_winter:
-            tips.extend(["Warm layers & jacket", "Thermal undergarments", "Waterproof boots"])
-        elif is_summer:
-            tips.extend(["Light summer clothing", "Sunscreen & sunglasses", "Hat for sun protection"])
-        else:
-            tips.extend(["Layered clothing for variable weather", "Light rain jacket"])
+        climate = "tropical" if abs(lat) < 23.5 else _CLIMATE_BY_MONTH[lat > 0][month - 1]
+        tips.extend(_CLIMATE_PACKING[climate])
 
         # Interest-based
         if "beaches" in interests or "islands" in interests:
@@ -540,11 +738,60 @@ VISA_POLICIES = {
     },
 }
 
+# Reverse index: home -> {destination -> requirement}. Categories are laid
+# down lowest-priority first, so a destination listed under several ends up
+# with the first one the original if-chain would have matched.
+_VISA_PRIORITY = ("visa_free", "visa_on_arrival", "e_visa", "visa_required")
+_VISA_LOOKUP: Dict[str, Dict[str, str]] = {}
+for _home, _policies in VISA_POLICIES.items():
+    _VISA_LOOKUP[_home] = {
+        destination: category
+        for category in reversed(_VISA_PRIORITY)
+        for destination in _policies.get(category, ())
+    }
+del _home, _policies
+
+# requirement -> (label, color, note template)
+_VISA_TEMPLATES = {
+    "home": (
+        "Home Country", "blue",
+        "No visa needed — this is your home country.",
+    ),
+    "visa_free": (
+        "Visa Free", "green",
+        "No visa required for {home} citizens visiting {destination}.",
+    ),
+    "visa_on_arrival": (
+        "Visa on Arrival", "green",
+        "Visa available on arrival for {home} citizens. Bring passport photos and fee.",
+    ),
+    "e_visa": (
+        "e-Visa", "yellow",
+        "Apply for e-Visa online before travel. Processing usually takes 3-7 business days.",
+    ),
+    "visa_required": (
+        "Visa Required", "red",
+        "Embassy/consulate visa required. Apply well in advance (4-8 weeks recommended).",
+    ),
+    "unknown": (
+        "Check Requirements", "gray",
+        "Please verify visa requirements for {home} → {destination} with your local embassy.",
+    ),
+}
+
+# Requirements whose note is fixed text, so lookups skip str.format for them
+_STATIC_VISA_NOTES = frozenset(
+    requirement for requirement, (_, _, note) in _VISA_TEMPLATES.items() if "{" not in note
+)
+
 
 def get_visa_info(home_country: str, destination: str) -> Dict:
     """
     Get visa requirement for traveling from home_country to destination.
 
+    Lookups are memoized per (home_country, destination); each call gets
+    its own copy of the result.
+
     Returns:
         {
             "requirement": "visa_free" | "visa_on_arrival" | "e_visa" | "visa_required" | "unknown",
@@ -553,51 +800,22 @@ def get_visa_info(home_country: str, destination: str) -> Dict:
             "note": str,
         }
     """
-    policies = VISA_POLICIES.get(home_country, VISA_POLICIES["_default"])
-
-    if home_country == destination:
-        return {
-            "requirement": "home",
-            "label": "Home Country",
-            "color": "blue",
-            "note": "No visa needed — this is your home country.",
-        }
-
-    if destination in policies.get("visa_free", []):
-        return {
-            "requirement": "visa_free",
-            "label": "Visa Free",
-            "color": "green",
-            "note": f"No visa required for {home_country} citizens visiting {destination}.",
-        }
+    return dict(_lookup_visa_info(home_country, destination))
 
-    if destination in policies.get("visa_on_arrival", []):
-        return {
-            "requirement": "visa_on_arrival",
-            "label": "Visa on Arrival",
-            "color": "green",
-            "note": f"Visa available on arrival for {home_country} citizens. Bring passport photos and fee.",
-        }
-
-    if destination in policies.get("e_visa", []):
-        return {
-            "requirement": "e_visa",
-            "label": "e-Visa",
-            "color": "yellow",
-            "note": f"Apply for e-Visa online before travel. Processing usually takes 3-7 business days.",
-        }
 
-    if destination in policies.get("visa_required", []):
-        return {
-            "requirement": "visa_required",
-            "label": "Visa Required",
-            "color": "red",
-            "note": f"Embassy/consulate visa required. Apply well in advance (4-8 weeks recommended).",
-        }
+@lru_cache(maxsize=4096)
+def _lookup_visa_info(home_country: str, destination: str) -> Dict:
+    if home_country == destination:
+        requirement = "home"
+    else:
+        policies = _VISA_LOOKUP.get(home_country, _VISA_LOOKUP["_default"])
+        requirement = policies.get(destination, "unknown")
 
+    label, color, note = _VISA_TEMPLATES[requirement]
     return {
-        "requirement": "unknown",
-        "label": "Check Requirements",
-        "color": "gray",
-        "note": f"Please verify visa requirements for {home_country} → {destination} with your local embassy.",
+        "requirement": requirement,
+        "label": label,
+        "color": color,
+        "note": note if requirement in _STATIC_VISA_NOTES
+                else note.format(home=home_country, destination=destination),
     }
@@ -3,15 +3,29 @@ Tour Optimizer Service
 
 Core algorithm module containing:
 - Haversine distance calculation (replaces broken Euclidean)
-- Nearest Neighbor TSP solver + 2-opt local search improvement
+- Nearest Neighbor TSP solver + 2-opt / Or-opt local search improvement
 - Interest-weighted day distribution
 
 This is the heart of the original project's algorithm, now corrected and enhanced.
 """
 
-from math import radians, sin, cos, sqrt, atan2
-from typing import List, Dict, Set, Tuple
-from backend.config import EARTH_RADIUS_KM, MIN_DAYS_PER_COUNTRY, TSP_2OPT_MAX_ITERATIONS
+from collections import OrderedDict
+from math import radians, sin, cos, sqrt, asin
+from typing import List, Dict, FrozenSet, Set, Tuple
+
+import numpy as np
+
+from backend.config import (
+    EARTH_RADIUS_KM, MIN_DAYS_PER_COUNTRY, TSP_2OPT_MAX_ITERATIONS,
+    TSP_OR_OPT_MAX_ITERATIONS, TSP_MULTISTART, TSP_CACHE_SIZE
+)
+from backend.services._tsp_kernels import nn_tsp, or_opt, two_opt
+
+# A local-search move must shorten the tour by more than this to count.
+# Reversing or relocating part of a symmetric tour can "gain" a few ulps
+# from float rounding alone; without a margin those no-op moves would be
+# accepted.
+LOCAL_SEARCH_EPSILON_KM = 1e-9
 
 
 class TourOptimizer:
@@ -21,13 +35,35 @@ class TourOptimizer:
     Improvements over original:
     - Haversine distance instead of Euclidean (critical fix)
     - 2-opt local search after Nearest Neighbor (5-15% better routes)
+    - Or-opt chain relocation to polish the 2-opt optimum
     - No mutation of input lists (bug fix)
     """
 
     def __init__(self, countries_data: Dict):
         self.countries_data = countries_data
-        # Pre-compute distance matrix for efficiency
-        self._distance_cache: Dict[Tuple[str, str], float] = {}
+        # Full pairwise distance matrix, built once: every solve (and every
+        # re-solve after budget enforcement) reads it instead of recomputing
+        self._names: List[str] = list(countries_data)
+        self._idx: Dict[str, int] = {name: i for i, name in enumerate(self._names)}
+        # Per-country trig terms, aligned with _names, evaluated once
+        coords = np.radians(np.array(
+            [data["coordinates"] for data in countries_data.values()], dtype=np.float64
+        ).reshape(-1, 2))
+        lat = coords[:, 0]
+        self._lon_rad: np.ndarray = coords[:, 1]
+        self._sin_lat: np.ndarray = np.sin(lat)
+        self._cos_lat: np.ndarray = np.cos(lat)
+        self._dist = self._build_distance_matrix()
+        # Each row lists every country by increasing distance; Nearest
+        # Neighbor walks these instead of scanning distances each step
+        self._neighbor_order: np.ndarray = np.argsort(self._dist, axis=1, kind="stable")
+        # Tours depend only on which countries are visited and from where,
+        # so re-plans that only tweak days or interests reuse a solved tour
+        self._tsp_cache: "OrderedDict[Tuple[FrozenSet[str], str], Tuple[str, ...]]" = OrderedDict()
+        # Country interests never change at runtime; freeze them once
+        self._interest_fs: Dict[str, FrozenSet[str]] = {
+            name: frozenset(data["interests"]) for name, data in countries_data.items()
+        }
 
     # ─── Distance Calculation ─────────────────────────────────────
 
@@ -53,27 +89,41 @@ class TourOptimizer:
         dlon = lon2 - lon1
 
         a = sin(dlat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dlon / 2) ** 2
-        c = 2 * atan2(sqrt(a), sqrt(1 - a))
+        # Clamp: rounding can push a a hair above 1 for antipodal points
+        c = 2 * asin(sqrt(a if a < 1.0 else 1.0))
 
         return EARTH_RADIUS_KM * c
 
-    def get_distance(self, country_a: str, country_b: str) -> float:
-        """Get distance between two countries, with caching."""
-        key = (country_a, country_b)
-        reverse_key = (country_b, country_a)
-
-        if key in self._distance_cache:
-            return self._distance_cache[key]
-        if reverse_key in self._distance_cache:
-            return self._distance_cache[reverse_key]
-
-        dist = self.haversine_distance(
-            self.countries_data[country_a]["coordinates"],
-            self.countries_data[country_b]["coordinates"]
-        )
-        self._distance_cache[key] = dist
+    def _build_distance_matrix(self) -> np.ndarray:
+        """
+        Great-circle distance for every country pair, as an (N, N) array.
+
+        Uses the spherical law of cosines rather than haversine: one arccos
+        over a broadcast dot product instead of several sin/cos terms per
+        pair. Between country centroids it agrees with haversine_distance
+        to well under a metre; haversine_distance stays the precise
+        single-pair formula.
+        """
+        sin_lat, cos_lat, lon = self._sin_lat, self._cos_lat, self._lon_rad
+
+        # Every term is symmetric in (i, j) (cos is even), so the matrix is
+        # exactly symmetric
+        cos_angle = (sin_lat[:, None] * sin_lat[None, :]
+                     + cos_lat[:, None] * cos_lat[None, :] * np.cos(lon[None, :] - lon[:, None]))
+        # Rounding can push |cos_angle| a hair past 1 (arccos would give NaN);
+        # clamp branch-free and in place rather than allocating a copy
+        np.clip(cos_angle, -1.0, 1.0, out=cos_angle)
+        dist = np.arccos(cos_angle, out=cos_angle)
+        dist *= EARTH_RADIUS_KM
+        # arccos is ill-conditioned near 1: rounding leaves the diagonal at
+        # a few metres instead of 0
+        np.fill_diagonal(dist, 0.0)
         return dist
 
+    def get_distance(self, country_a: str, country_b: str) -> float:
+        """Get distance between two countries from the precomputed matrix."""
+        return float(self._dist[self._idx[country_a], self._idx[country_b]])
+
     # ─── TSP Solver ───────────────────────────────────────────────
 
     def nearest_neighbor_tsp(self, countries: List[str], home: str) -> List[str]:
@@ -81,7 +131,9 @@ class TourOptimizer:
         Nearest Neighbor heuristic for TSP.
         
         Builds a route by always visiting the closest unvisited country next.
-        Time complexity: O(n²)
+        Each step walks the current country's precomputed neighbor order to
+        the first stop not yet visited, so it rarely looks past a few entries.
+        Time complexity: O(n·N) worst case for N countries in the database.
         
         NOTE: Unlike the original, this does NOT mutate the input list.
         """
@@ -91,55 +143,49 @@ class TourOptimizer:
         if not to_visit:
             return [home, home]
 
-        route = [home]
-        current = home
-
-        while to_visit:
-            nearest = min(to_visit, key=lambda x: self.get_distance(current, x))
-            route.append(nearest)
-            to_visit.remove(nearest)
-            current = nearest
-
-        route.append(home)  # Return home
-        return route
+        idx = self._idx
+        route = nn_tsp(
+            self._neighbor_order, idx[home],
+            np.fromiter((idx[c] for c in to_visit), dtype=np.int64, count=len(to_visit)),
+        )
+        return [self._names[k] for k in route]
 
-    def two_opt_improve(self, route: List[str]) -> List[str]:
+    def two_opt_improve(
+        self,
+        route: List[str],
+        max_iterations: int = TSP_2OPT_MAX_ITERATIONS
+    ) -> List[str]:
         """
         2-opt local search improvement for TSP routes.
         
         Iteratively reverses segments of the route to find shorter paths.
         Typically improves Nearest Neighbor solutions by 5-15%.
+
+        Best-improvement variant: each iteration scores every candidate
+        reversal and applies the single best one, until no reversal shortens
+        the tour or max_iterations moves are made. The search itself runs in
+        _tsp_kernels (compiled with Numba when it is installed).
         
-        The first and last elements (home country) are fixed.
+        The first and last elements (home country) are fixed. The result is
+        given the same fixed direction as solve_tsp's (see _orient).
         """
-        if len(route) <= 4:  # Need at least 2 intermediate stops to swap
-            return route
-
-        best_route = route[:]
-        best_distance = self._route_total_distance(best_route)
-        improved = True
-        iterations = 0
-
-        while improved and iterations < TSP_2OPT_MAX_ITERATIONS:
-            improved = False
-            iterations += 1
-
-            # Only swap intermediate nodes (keep home country fixed at start/end)
-            for i in range(1, len(best_route) - 2):
-                for j in range(i + 1, len(best_route) - 1):
-                    new_route = best_route[:i] + best_route[i:j + 1][::-1] + best_route[j + 1:]
-                    new_distance = self._route_total_distance(new_route)
-
-                    if new_distance < best_distance:
-                        best_route = new_route
-                        best_distance = new_distance
-                        improved = True
-
-        return best_route
+        r = np.fromiter((self._idx[c] for c in route), dtype=np.int64, count=len(route))
+        if len(r) > 4:  # With 2 stops or fewer every order is the same tour
+            r = two_opt(self._dist, r, max_iterations, LOCAL_SEARCH_EPSILON_KM)
+        return [self._names[k] for k in self._orient(r)]
 
     def solve_tsp(self, countries: List[str], home: str) -> List[str]:
         """
-        Full TSP solver: Nearest Neighbor + 2-opt improvement.
+        Full TSP solver: multi-start Nearest Neighbor + 2-opt, polished by Or-opt.
+
+        Nearest Neighbor is seeded from home and from up to
+        TSP_MULTISTART - 1 of the trip's most central stops (each tour is
+        then rotated to start at home). Every seed gets the same local
+        search, and the shortest result wins; home's own tour is kept on
+        ties, so extra seeds can only shorten the route.
+
+        Results are memoized per (set of countries, home) in a small LRU,
+        so asking for the same trip again skips the search.
         
         Args:
             countries: List of countries to visit (will NOT be mutated)
@@ -148,10 +194,79 @@ class TourOptimizer:
         Returns:
             Optimized route [home, country1, country2, ..., home]
         """
-        initial_route = self.nearest_neighbor_tsp(countries, home)
-        optimized_route = self.two_opt_improve(initial_route)
+        key = (frozenset(countries), home)
+        cached = self._tsp_cache.get(key)
+        if cached is not None:
+            self._tsp_cache.move_to_end(key)
+            return list(cached)  # callers may edit the route they get back
+
+        to_visit = [c for c in dict.fromkeys(countries) if c != home]
+        if not to_visit:
+            optimized_route = [home, home]
+        else:
+            idx = self._idx
+            h = idx[home]
+            stops = np.fromiter((idx[c] for c in to_visit), dtype=np.int64, count=len(to_visit))
+            best, best_km = None, np.inf
+            for start in self._multistart_seeds(h, stops):
+                r = self._local_search(self._nn_tour_from(start, h, stops))
+                km = float(self._dist[r[:-1], r[1:]].sum())
+                if km < best_km - LOCAL_SEARCH_EPSILON_KM:
+                    best, best_km = r, km
+            optimized_route = [self._names[k] for k in self._orient(best)]
+
+        self._tsp_cache[key] = tuple(optimized_route)
+        if len(self._tsp_cache) > TSP_CACHE_SIZE:
+            self._tsp_cache.popitem(last=False)
         return optimized_route
 
+    def _multistart_seeds(self, home: int, stops: np.ndarray) -> List[int]:
+        """Home first, then the stops with the least total distance to the rest of the trip."""
+        if len(stops) <= 2:  # a cycle through 3 or fewer places has only one tour
+            return [home]
+        n_extra = TSP_MULTISTART - 1
+        if len(stops) <= n_extra:
+            return [home, *stops.tolist()]
+        spread = self._dist[np.ix_(stops, np.append(stops, home))].sum(axis=1)
+        return [home, *stops[np.argsort(spread, kind="stable")[:n_extra]].tolist()]
+
+    def _nn_tour_from(self, start: int, home: int, stops: np.ndarray) -> np.ndarray:
+        """Nearest Neighbor cycle grown from start, as an index route from home to home."""
+        if start == home:
+            return nn_tsp(self._neighbor_order, home, stops)
+        cycle = nn_tsp(self._neighbor_order, start, np.append(stops, home))[:-1]
+        p = int(np.flatnonzero(cycle == home)[0])
+        return np.concatenate((cycle[p:], cycle[:p], cycle[p:p + 1]))
+
+    def _orient(self, r: np.ndarray) -> np.ndarray:
+        """
+        Give an index route home -> ... -> home a fixed direction.
+
+        A tour and its reverse are the same length, so which one the search
+        ends on comes down to float rounding. But the direction decides the
+        itinerary dates and which stops win leftover days. The route flies
+        the shorter first leg out of home, and the lower country index wins
+        a tie.
+        """
+        home, first, last = r[0], r[1], r[-2]
+        gap = self._dist[home, last] - self._dist[home, first]
+        if gap < -LOCAL_SEARCH_EPSILON_KM or (gap <= LOCAL_SEARCH_EPSILON_KM and last < first):
+            return r[::-1].copy()
+        return r
+
+    def _local_search(self, r: np.ndarray) -> np.ndarray:
+        """
+        2-opt, then Or-opt, on an index route.
+
+        2-opt runs again after Or-opt, since a relocation can open up new
+        reversals.
+        """
+        r = two_opt(self._dist, r, TSP_2OPT_MAX_ITERATIONS, LOCAL_SEARCH_EPSILON_KM)
+        polished = or_opt(self._dist, r, TSP_OR_OPT_MAX_ITERATIONS, LOCAL_SEARCH_EPSILON_KM)
+        if not np.array_equal(polished, r):
+            r = two_opt(self._dist, polished, TSP_2OPT_MAX_ITERATIONS, LOCAL_SEARCH_EPSILON_KM)
+        return r
+
     def _route_total_distance(self, route: List[str]) -> float:
         """Calculate total distance of a route."""
         total = 0.0
@@ -184,52 +299,36 @@ class TourOptimizer:
         if not countries:
             return {}
 
-        # Calculate interest scores
-        interest_scores = {
-            country: len(set(self.countries_data[country]["interests"]) & selected_interests)
-            for country in countries
-        }
-
-        total_score = sum(interest_scores.values())
-        days_per_country: Dict[str, int] = {}
+        # Interest scores and days live in arrays aligned with countries, so
+        # the proportional split is one vectorized step instead of dict updates
+        n = len(countries)
+        scores = np.fromiter(
+            (len(self._interest_fs[country] & selected_interests) for country in countries),
+            dtype=np.int64, count=n
+        )
+        total_score = int(scores.sum())
 
         if total_score == 0:
             # No interest overlap — distribute equally
-            base_days = total_days // len(countries)
-            days_per_country = {country: max(base_days, MIN_DAYS_PER_COUNTRY) for country in countries}
+            days = np.full(n, max(total_days // n, MIN_DAYS_PER_COUNTRY), dtype=np.int64)
         else:
             # Assign minimum days first
-            remaining_days = total_days
-            for country in countries:
-                days_per_country[country] = MIN_DAYS_PER_COUNTRY
-                remaining_days -= MIN_DAYS_PER_COUNTRY
+            days = np.full(n, MIN_DAYS_PER_COUNTRY, dtype=np.int64)
+            remaining_days = total_days - n * MIN_DAYS_PER_COUNTRY
 
             # Distribute remaining days proportionally to interest scores
-            for country in countries:
-                if total_score > 0 and remaining_days > 0:
-                    additional = int((remaining_days * interest_scores[country]) / total_score)
-                    days_per_country[country] += additional
-
-            # Distribute any leftover days to highest-interest countries
-            distributed = sum(days_per_country.values())
-            leftover = total_days - distributed
-
-            sorted_countries = sorted(
-                countries,
-                key=lambda x: (interest_scores[x], -days_per_country[x]),
-                reverse=True
-            )
-
-            for country in sorted_countries:
-                if leftover > 0:
-                    days_per_country[country] += 1
-                    leftover -= 1
-                else:
-                    break
-
-        return days_per_country
+            if remaining_days > 0:
+                days += remaining_days * scores // total_score
+
+            # Distribute any leftover days to highest-interest countries:
+            # highest score first, then fewest days, then route order (lexsort
+            # is stable, so it ranks exactly like the original stable sort)
+            leftover = total_days - int(days.sum())
+            if leftover > 0:
+                days[np.lexsort((days, -scores))[:leftover]] += 1
+
+        return dict(zip(countries, days.tolist()))
 
     def calculate_interest_score(self, country: str, interests: Set[str]) -> int:
         """Score a country by how many user interests it matches."""
-        country_interests = set(self.countries_data[country]["interests"])
-        return len(country_interests & interests)
+        return len(self._interest_fs[country] & interests)